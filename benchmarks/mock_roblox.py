@@ -0,0 +1,230 @@
+import time
+import random
+import asyncio
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+from aiohttp import web
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+HOSTS = ("users.roblox.com", "auth.roblox.com", "accountsettings.roblox.com")
+
+COOKIE_PREFIX = "_|WARNING:-DO-NOT-SHARE-THIS.--Sharing-this-will-allow-someone-to-log-in-as-you-and-to-steal-your-ROBUX-and-items.|_"
+
+# Largest batch the real multi-get endpoints accept
+MAX_BATCH = 100
+
+FIRST_USER_ID = 1000000
+
+
+class MockAccount:
+    def __init__(self, username, token, user_id, is_banned=False, token_valid=True):
+        self.username = username
+        self.token = token
+        self.user_id = user_id
+        self.is_banned = is_banned
+        self.token_valid = token_valid
+
+
+def build_roster(size, ban_rate=0.05, invalid_rate=0.01, seed=0):
+    """Synthetic accounts; the first one plays the main account"""
+    rng = random.Random(seed)
+    roster = []
+    for index in range(size):
+        roster.append(MockAccount(
+            username="bench_main" if index == 0 else f"bench_{index:05d}",
+            token=f"token-{index}",
+            user_id=FIRST_USER_ID + index,
+            is_banned=index > 0 and rng.random() < ban_rate,
+            token_valid=index == 0 or rng.random() >= invalid_rate
+        ))
+    return roster
+
+
+class MockRoblox:
+    """
+    Local aiohttp server imitating the Roblox hosts the bot talks to.
+    Each host is mounted under its own path prefix (/users.roblox.com/...),
+    and every request can be delayed, failed or throttled on purpose.
+    """
+
+    def __init__(self, roster, latency=0.05, jitter=0.5, error_rate=0.0, throttle_rate=0.0,
+                 retry_after=1.0, host_rps=0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.host_rps = host_rps
+        self._rng = random.Random(seed)
+
+        self.by_name = {account.username.lower(): account for account in roster}
+        self.by_id = {account.user_id: account for account in roster}
+        self.by_token = {account.token: account for account in roster}
+
+        self.requests = {}
+        self.throttled = 0
+        self.errors = 0
+        self._windows = {}
+        self._runner = None
+        self.url = None
+
+    def reset_counters(self):
+        self.requests = {}
+        self.throttled = 0
+        self.errors = 0
+
+    def _over_host_limit(self, host):
+        """Fixed one-second window per host, like the real per-IP limits"""
+        if not self.host_rps:
+            return False
+        window = int(time.monotonic())
+        start, count = self._windows.get(host, (window, 0))
+        if start != window:
+            start, count = window, 0
+        self._windows[host] = (start, count + 1)
+        return count >= self.host_rps
+
+    @web.middleware
+    async def _faults(self, request, handler):
+        host = request.path.split("/", 2)[1]
+        self.requests[host] = self.requests.get(host, 0) + 1
+
+        if self.latency:
+            spread = self.latency * self.jitter
+            await asyncio.sleep(max(0.0, self._rng.uniform(self.latency - spread, self.latency + spread)))
+
+        if self._over_host_limit(host) or self._rng.random() < self.throttle_rate:
+            self.throttled += 1
+            return web.json_response(
+                {"errors": [{"code": 0, "message": "Too many requests"}]},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)}
+            )
+        if self._rng.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response({"errors": [{"code": 0, "message": "InternalServerError"}]}, status=500)
+        return await handler(request)
+
+    def _account_from_cookie(self, request):
+        cookie = request.headers.get("Cookie", "")
+        if not cookie.startswith(".ROBLOSECURITY="):
+            return None
+        token = cookie[len(".ROBLOSECURITY="):]
+        if token.startswith(COOKIE_PREFIX):
+            token = token[len(COOKIE_PREFIX):]
+        account = self.by_token.get(token)
+        return account if account is not None and account.token_valid else None
+
+    @staticmethod
+    def _user_json(account):
+        return {
+            "id": account.user_id,
+            "name": account.username,
+            "displayName": account.username,
+            "hasVerifiedBadge": False,
+        }
+
+    async def usernames_users(self, request):
+        body = await request.json()
+        usernames = body.get("usernames", [])
+        if len(usernames) > MAX_BATCH:
+            return web.json_response({"errors": [{"code": 2, "message": "Too many usernames."}]}, status=400)
+
+        data = []
+        for username in usernames:
+            account = self.by_name.get(username.lower())
+            if account is None or (account.is_banned and body.get("excludeBannedUsers")):
+                continue
+            data.append(dict(self._user_json(account), requestedUsername=username))
+        return web.json_response({"data": data})
+
+    async def users(self, request):
+        body = await request.json()
+        user_ids = body.get("userIds", [])
+        if len(user_ids) > MAX_BATCH:
+            return web.json_response({"errors": [{"code": 1, "message": "Too many ids."}]}, status=400)
+
+        data = []
+        for user_id in user_ids:
+            account = self.by_id.get(user_id)
+            if account is None or (account.is_banned and body.get("excludeBannedUsers")):
+                continue
+            data.append(self._user_json(account))
+        return web.json_response({"data": data})
+
+    async def user(self, request):
+        account = self.by_id.get(int(request.match_info["user_id"]))
+        if account is None:
+            return web.json_response({"errors": [{"code": 3, "message": "The user id is invalid."}]}, status=404)
+        return web.json_response(dict(
+            self._user_json(account),
+            description="",
+            created="2020-01-01T00:00:00Z",
+            isBanned=account.is_banned
+        ))
+
+    async def authenticated(self, request):
+        account = self._account_from_cookie(request)
+        if account is None:
+            return web.json_response({"errors": [{"code": 0, "message": "Unauthorized"}]}, status=401)
+        return web.json_response(self._user_json(account))
+
+    async def logout(self, request):
+        # Roblox hands out CSRF tokens by rejecting this call
+        return web.json_response(
+            {"errors": [{"code": 0, "message": "Token Validation Failed"}]},
+            status=403,
+            headers={"x-csrf-token": secrets.token_hex(6)}
+        )
+
+    async def ban_status(self, request):
+        account = self._account_from_cookie(request)
+        if account is None or account.user_id != int(request.match_info["user_id"]):
+            return web.json_response({"errors": [{"code": 0, "message": "Unauthorized"}]}, status=401)
+        if not account.is_banned:
+            return web.json_response({"isBanned": False})
+        ban_end = datetime.now(timezone.utc) + timedelta(days=7)
+        return web.json_response({
+            "isBanned": True,
+            "banDuration": "7 days",
+            "banEndDate": ban_end.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "bannedFromPlace": None,
+            "reasonText": "Benchmark ban",
+        })
+
+    def app(self):
+        users = web.Application()
+        users.router.add_post("/v1/usernames/users", self.usernames_users)
+        users.router.add_post("/v1/users", self.users)
+        users.router.add_get("/v1/users/authenticated", self.authenticated)
+        users.router.add_get("/v1/users/{user_id:\\d+}", self.user)
+
+        auth = web.Application()
+        auth.router.add_post("/v2/logout", self.logout)
+
+        accountsettings = web.Application()
+        accountsettings.router.add_get("/v1/users/{user_id:\\d+}/ban-status", self.ban_status)
+
+        app = web.Application(middlewares=[self._faults])
+        app.add_subapp("/users.roblox.com/", users)
+        app.add_subapp("/auth.roblox.com/", auth)
+        app.add_subapp("/accountsettings.roblox.com/", accountsettings)
+        return app
+
+    async def start(self, host="127.0.0.1", port=0):
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{port}"
+        logger.info(f"Mock Roblox API listening on {self.url}")
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
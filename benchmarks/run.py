@@ -0,0 +1,289 @@
+"""
+Throughput benchmark for the account monitor.
+
+Starts a local mock of the Roblox API, points the bot's shared HTTP client
+at it and times validate_all_accounts, monitor_accounts and the
+!list_accounts probe against synthetic rosters. Every roster size runs in
+its own process so module state and peak memory don't carry over.
+
+    python -m benchmarks.run --sizes 10,1000,10000 --latency 50
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import subprocess
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.mock_roblox import MockRoblox, build_roster
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class RequestRecorder:
+    """Wraps the raw aiohttp session: sends Roblox URLs to the mock and times each request"""
+
+    def __init__(self, session, base_url):
+        self._session = session
+        self.base_url = base_url
+        self.reset()
+
+    def reset(self):
+        self.latencies = []
+        self.statuses = {}
+
+    async def request(self, method, url, **kwargs):
+        parts = urlsplit(url)
+        target = f"{self.base_url}/{parts.hostname}{parts.path}"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        kwargs.pop("ssl", None)
+
+        started = time.perf_counter()
+        response = await self._session.request(method, target, **kwargs)
+        self.latencies.append(time.perf_counter() - started)
+        self.statuses[response.status] = self.statuses.get(response.status, 0) + 1
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+class DiscardSink:
+    """Stands in for alert delivery, counting what would have been sent"""
+
+    def __init__(self):
+        self.messages = 0
+        self.embeds = 0
+
+    def deliver(self, embeds):
+        self.messages += 1
+        self.embeds += len(embeds)
+
+
+def write_environment(directory, args):
+    """config.json and .env for the bot under test"""
+    config = {
+        "discord_bot_token": "benchmark",
+        "log_channel_id": 0,
+        "mod_role_id": 0,
+        "appeal_url": "https://example.com",
+        "private_ban_checks": False,
+        "max_concurrent_checks": args.concurrency,
+        # Everything is due at once, so one monitor run is one full cycle
+        "poll_interval": 0,
+        "alert_digest_window": 0.1,
+    }
+    if args.unlimited:
+        config["rate_limits"] = {
+            host: {"rate": 1000000, "burst": 1000000}
+            for host in ("users.roblox.com", "auth.roblox.com", "accountsettings.roblox.com")
+        }
+    with open(os.path.join(directory, "config.json"), "w") as f:
+        json.dump(config, f)
+    with open(os.path.join(directory, ".env"), "w") as f:
+        f.write("ROBLOX_USERNAME=bench_main\nROBLOX_TOKEN=token-0\n")
+
+
+async def measure(name, size, server, recorder, coro):
+    server.reset_counters()
+    recorder.reset()
+    started = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - started
+    # Process high-water mark, so each scenario shows the peak reached by the time it finished
+    peak = peak_memory_mb()
+    requests = sum(server.requests.values())
+    return {
+        "scenario": name,
+        "accounts": size,
+        "seconds": round(elapsed, 3),
+        "requests": requests,
+        "requests_per_account": round(requests / size, 3),
+        "by_host": dict(server.requests),
+        "p50_ms": round(percentile(recorder.latencies, 50) * 1000, 2) if recorder.latencies else None,
+        "p99_ms": round(percentile(recorder.latencies, 99) * 1000, 2) if recorder.latencies else None,
+        "throttled": server.throttled,
+        "errors": server.errors,
+        "peak_memory_mb": round(peak, 1) if peak is not None else None,
+    }
+
+
+async def run_worker(args):
+    """Benchmark one roster size inside this process"""
+    roster = build_roster(args.accounts, ban_rate=args.ban_rate, invalid_rate=args.invalid_rate, seed=args.seed)
+    server = MockRoblox(
+        roster,
+        latency=args.latency / 1000,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        host_rps=args.host_rps,
+        seed=args.seed
+    )
+    await server.start()
+
+    workdir = tempfile.mkdtemp(prefix="roblox-bench-")
+    write_environment(workdir, args)
+    os.chdir(workdir)
+
+    # The bot reads config.json and .env from the working directory at import
+    import main as bot_main
+    from utils.scheduler import PollScheduler
+
+    bot_main.registry.replace({account.username: account.token for account in roster[1:]})
+
+    session = bot_main.http_client.session
+    recorder = RequestRecorder(session.raw, server.url)
+    session.raw = recorder
+
+    channel = DiscardSink()
+    bot_main.alert_queue.deliver = channel.deliver
+    bot_main.alert_queue.start()
+
+    def fresh_scheduler():
+        bot_main.scheduler = PollScheduler(base_interval=0, min_interval=0)
+
+    results = []
+    try:
+        bot_main.validation_cache.clear()
+        results.append(await measure(
+            "validate_all_accounts", args.accounts, server, recorder, bot_main.validate_all_accounts()
+        ))
+
+        fresh_scheduler()
+        results.append(await measure(
+            "monitor_accounts (cold)", args.accounts, server, recorder, bot_main.monitor_accounts()
+        ))
+
+        # User IDs are cached and known bans skip their detail lookups
+        fresh_scheduler()
+        results.append(await measure(
+            "monitor_accounts (warm)", args.accounts, server, recorder, bot_main.monitor_accounts()
+        ))
+
+        bot_main.validation_cache.clear()
+        listed = [(account.username, account.token, "") for account in roster]
+        results.append(await measure(
+            "list_accounts", args.accounts, server, recorder, bot_main.probe_listed_accounts(listed)
+        ))
+    finally:
+        await bot_main.alert_queue.stop()
+        await bot_main.http_client.close()
+        await server.stop()
+
+    results.append({"scenario": "alerts", "accounts": args.accounts, "messages": channel.messages, "embeds": channel.embeds})
+    return results
+
+
+def worker_command(args, size):
+    command = [
+        sys.executable, "-m", "benchmarks.run", "--worker",
+        "--accounts", str(size),
+        "--latency", str(args.latency),
+        "--error-rate", str(args.error_rate),
+        "--throttle-rate", str(args.throttle_rate),
+        "--retry-after", str(args.retry_after),
+        "--host-rps", str(args.host_rps),
+        "--ban-rate", str(args.ban_rate),
+        "--invalid-rate", str(args.invalid_rate),
+        "--concurrency", str(args.concurrency),
+        "--seed", str(args.seed),
+        "--log-level", args.log_level,
+    ]
+    if args.unlimited:
+        command.append("--unlimited")
+    return command
+
+
+def print_table(results):
+    header = f"{'scenario':<26}{'accounts':>9}{'seconds':>10}{'req/acct':>10}{'p50 ms':>9}{'p99 ms':>9}{'429s':>7}{'5xx':>6}{'peak MB':>9}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        if "seconds" not in result:
+            continue
+        print(
+            f"{result['scenario']:<26}{result['accounts']:>9}{result['seconds']:>10.2f}"
+            f"{result['requests_per_account']:>10.2f}{result['p50_ms'] or 0:>9.1f}{result['p99_ms'] or 0:>9.1f}"
+            f"{result['throttled']:>7}{result['errors']:>6}{result['peak_memory_mb'] or 0:>9.1f}"
+        )
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark the account monitor against a mock Roblox API')
+    parser.add_argument('--sizes', type=str, default='10,1000,10000', help='Comma-separated roster sizes')
+    parser.add_argument('--latency', type=float, default=50, help='Mean response latency in milliseconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with a 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with a 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After sent with mock 429s, in seconds')
+    parser.add_argument('--host-rps', type=int, default=0, help='Requests per second each mock host accepts before 429ing (0 = no limit)')
+    parser.add_argument('--ban-rate', type=float, default=0.05, help='Fraction of synthetic accounts that are banned')
+    parser.add_argument('--invalid-rate', type=float, default=0.01, help='Fraction of synthetic accounts with a rejected token')
+    parser.add_argument('--concurrency', type=int, default=10, help='max_concurrent_checks for the bot under test')
+    parser.add_argument('--unlimited', action='store_true', help='Lift the client-side rate limits to measure raw throughput')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the roster and injected faults')
+    parser.add_argument('--output', type=str, help='Also write the raw results to this JSON file')
+    parser.add_argument('--log-level', type=str, default='WARNING', help='Log level for the bot under test')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--accounts', type=int, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    if args.worker:
+        # Configure logging first; the bot's setup_logging leaves existing root handlers alone
+        logging.basicConfig(level=args.log_level, format='%(asctime)s - %(levelname)s - %(message)s')
+        print(json.dumps(asyncio.run(run_worker(args))))
+        return
+
+    results = []
+    for size in (int(size) for size in args.sizes.split(',') if size.strip()):
+        print(f"Benchmarking {size} accounts...", file=sys.stderr)
+        completed = subprocess.run(
+            worker_command(args, size), cwd=ROOT, stdout=subprocess.PIPE, universal_newlines=True
+        )
+        if completed.returncode != 0:
+            print(f"Benchmark for {size} accounts failed (exit code {completed.returncode})", file=sys.stderr)
+            continue
+        results.extend(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print_table(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
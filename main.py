@@ -2,10 +2,28 @@ import discord
 from discord.ext import commands, tasks
 import json
 import logging
-import aiohttp
-from utils.auth_handler import validate_credentials
+from utils.auth_handler import check_credentials, validate_credentials, validation_cache
 from utils.roblox_api import check_account_status
-from utils.config import Config
+from utils.config import Config, registry
+from utils.user_resolver import UserIdCache
+from utils.roblox_client import roblox_client, RobloxClient, BanDetails, BanDetailCache, RobloxApiError
+from utils.batch_check import run_batch_check
+from utils.http_client import http_client
+from utils.scheduler import PollScheduler
+from utils.alerts import AlertQueue
+from utils.delivery import AlertDelivery, build_sinks
+from utils.pagination import build_pages, send_pages
+from utils.cache import LRUCache, SingleFlight
+from utils.metrics import metrics, MetricsServer, track_caches, request_latency, CYCLE_BUCKETS
+from utils.sharding import Coordinator, ShardWorker
+from utils.history import HistoryStore
+from utils.stats import RosterStats
+from utils.logs import setup_logging, request_sampler
+from utils.circuit_breaker import CircuitOpenError, STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
+from utils.state_store import (
+    StateStore, parse_roblox_date, STATUS_ACTIVE, STATUS_BANNED, STATUS_INVALID, STATUS_NOT_FOUND,
+    EVENT_BAN_EXTENDED, EVENT_NOT_FOUND, EVENT_TOKEN_INVALID, EVENT_UNBANNED
+)
 import argparse
 import sys
 from discord.ext.commands import MissingRequiredArgument
@@ -16,7 +34,10 @@ import subprocess
 import asyncio
 import socket
 import platform
+import time
 
+# Reference point for the startup time metric
+PROCESS_STARTED = time.monotonic()
 
 # Load configuration
 with open("config.json", "r") as f:
@@ -24,132 +45,460 @@ with open("config.json", "r") as f:
 
 intents = discord.Intents.default()
 intents.message_content = True  # Enable message content intent
-bot = commands.Bot(command_prefix="!", intents=intents)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+class MonitorBot(commands.Bot):
+    async def close(self):
+        # Flush pending alerts while the connection is still open
+        await alert_queue.stop()
+        await alert_delivery.stop()
+        await metrics_server.stop()
+        if coordinator is not None:
+            await coordinator.stop()
+        history.close()
+        await super().close()
+        # Release the shared HTTP connection pool on shutdown
+        await http_client.close()
+
+bot = MonitorBot(command_prefix="!", intents=intents)
+
+# Every alert sink gets its own copy of each message, queued on disk until delivered
+alert_delivery = AlertDelivery(
+    build_sinks(
+        config.get("alert_sinks") or [{"type": "channel", "channel_id": config["log_channel_id"]}],
+        bot.get_channel,
+        lambda: http_client.session.raw
+    ),
+    path=config.get("alert_queue_db", "alert_queue.db"),
+    base_delay=config.get("alert_retry_base_delay", 5),
+    max_delay=config.get("alert_retry_max_delay", 900),
+    max_attempts=config.get("alert_max_attempts", 12)
+)
+
+# Outbound alerts, merged into digests when several arrive together
+alert_queue = AlertQueue(alert_delivery.enqueue, window=config.get("alert_digest_window", 5))
+
+# Additional accounts live in a local SQLite database
+registry.db_path = config.get("accounts_db", "accounts.db")
+
+# Tune the shared HTTP connection pool and per-host rate limits
+http_client.configure(
+    limit=config.get("http_pool_size", 100),
+    limit_per_host=config.get("http_pool_per_host", 20),
+    dns_cache_ttl=config.get("dns_cache_ttl", 300),
+    rate_limits=config.get("rate_limits"),
+    max_retries=config.get("rate_limit_retries", 3),
+    connect_timeout=config.get("http_connect_timeout", 5),
+    read_timeout=config.get("http_read_timeout", 15),
+    breaker_threshold=config.get("circuit_breaker_threshold", 5),
+    breaker_reset=config.get("circuit_breaker_reset", 30)
+)
+
+def on_breaker_state_change(host, previous, state):
+    """Tell the log channel once when a Roblox host goes down or recovers"""
+    if state == STATE_OPEN and previous == STATE_CLOSED:
+        alert_queue.put(discord.Embed(
+            title="Roblox API unavailable",
+            description=f"Requests to {host} keep failing. Affected checks are marked unknown until it recovers.",
+            color=discord.Color.red()
+        ))
+    elif state == STATE_CLOSED:
+        alert_queue.put(discord.Embed(
+            title="Roblox API recovered",
+            description=f"Requests to {host} are succeeding again.",
+            color=discord.Color.green()
+        ))
+
+http_client.breakers.on_state_change = on_breaker_state_change
+
+# Configure logging; records are written from a background thread
+setup_logging(
+    level=config.get("log_level", "INFO"),
+    json_format=config.get("log_format", "json") == "json"
 )
 logger = logging.getLogger(__name__)
 
+# Full request/response logging is off unless enabled, and then only for a sample
+request_sampler.configure(
+    enabled=config.get("verbose_http_logging", False),
+    sample_rate=config.get("verbose_http_sample_rate", 0.01)
+)
+
+# Reuse credential checks for a while instead of revalidating on every command
+validation_cache.ttl = config.get("validation_cache_ttl", 600)
+
+# Sentinel for cache misses where None is a valid cached value
+MISSING = object()
+
 # Dictionary to store accounts
 accounts = {}
 
-@tasks.loop(minutes=5)
+# Registry version the monitored accounts were last built from
+accounts_version = None
+
+def refresh_monitored_accounts():
+    """Rebuild the monitored accounts from the registry when it has changed"""
+    global accounts_version
+    roblox_config = Config.get_roblox_config()
+    if registry.version == accounts_version:
+        return
+    accounts_version = registry.version
+
+    accounts.clear()
+    if roblox_config['username'] and roblox_config['token']:
+        accounts[roblox_config['username']] = roblox_config['token']
+    accounts.update(Config.get_additional_accounts())
+    roster_stats.retain(accounts)
+
+# Persistent username -> user ID cache shared by every lookup
+user_id_cache = UserIdCache(config.get("user_id_cache_file", "user_ids.json"))
+roblox_client.user_id_cache = user_id_cache
+
+# Details of current bans, fetched once per ban and kept until it ends
+roblox_client.ban_details = BanDetailCache(config.get("ban_details_file", "ban_details.json"))
+
+# Last known status of every monitored account
+state_store = StateStore(config.get("state_file", "account_state.json"))
+
+# Totals for !stats, kept up to date by every check result
+roster_stats = RosterStats(config.get("stats_file", "roster_stats.json"))
+roster_stats.seed(state_store.statuses())
+
+# Every observation, run-length encoded per user ID, for !history
+history = HistoryStore(config.get("history_db", "history.db"), max_gap=config.get("history_max_gap", 3600))
+
+# Decides when each account is next due for a check
+scheduler = PollScheduler(
+    base_interval=config.get("poll_interval", 300),
+    min_interval=config.get("min_poll_interval", 60),
+    max_interval=config.get("max_poll_interval", 1800),
+    priority_interval=config.get("priority_poll_interval", 60),
+    priority_accounts=config.get("priority_accounts", [])
+)
+
+# Optional Prometheus endpoint, only served when metrics_port is set
+metrics_server = MetricsServer(host=config.get("metrics_host", "127.0.0.1"), port=config.get("metrics_port"))
+
+cycle_duration = metrics.histogram(
+    "monitor_cycle_duration_seconds", "Time taken by each monitor cycle", buckets=CYCLE_BUCKETS
+)
+accounts_checked = metrics.gauge("monitor_accounts_checked", "Accounts checked in the last monitor cycle")
+account_checks = metrics.counter("monitor_checks_total", "Account checks by resulting status", ("status",))
+schedule_lag = metrics.gauge("monitor_schedule_lag_seconds", "How far the most overdue account is behind its deadline")
+metrics.gauge(
+    "monitor_tick_interval_seconds", "Seconds between monitor cycles",
+    function=lambda: {(): monitor_accounts.seconds}
+)
+metrics.gauge("monitor_accounts_scheduled", "Accounts tracked by the scheduler", function=lambda: {(): len(scheduler)})
+metrics.gauge("alert_queue_depth", "Alerts waiting to be sent", function=lambda: {(): len(alert_queue)})
+metrics.gauge(
+    "alert_delivery_pending", "Alert messages queued on disk per sink", ("sink",),
+    function=lambda: {(("sink", sink),): count for sink, count in alert_delivery.pending().items()}
+)
+BREAKER_STATE_VALUES = {STATE_CLOSED: 0, STATE_HALF_OPEN: 1, STATE_OPEN: 2}
+metrics.gauge(
+    "circuit_breaker_state", "Breaker state per Roblox host (0 closed, 1 half-open, 2 open)", ("host",),
+    function=lambda: {(("host", breaker.host),): BREAKER_STATE_VALUES[breaker.state] for breaker in http_client.breakers}
+)
+startup_seconds = metrics.gauge("bot_startup_seconds", "Seconds from process start until the bot was ready")
+validation_seconds = metrics.gauge(
+    "startup_validation_seconds", "Seconds taken by the background validation of every account"
+)
+
+# Background validation started once the bot is ready
+startup_validation = None
+
+def record_status(username, status, ban_data=None, user_id=None):
+    """
+    Store a check result and queue an alert if the account's status changed.
+    Returns the transition event, or None if nothing changed.
+    """
+    ban_end_date = ban_data.get("banEndDate") if ban_data else None
+    event = state_store.record(username, status, ban_end_date)
+    roster_stats.record(username, status)
+    if user_id is None:
+        user_id = user_id_cache.get(username)
+    if user_id is not None:
+        # Still-banned checks reuse the saved ban end when details weren't refetched
+        history.record(user_id, status, parse_roblox_date(state_store.get(username)["ban_end_date"]), event)
+    if event:
+        # Hand the alert to the background sender so probes never wait on Discord
+        alert_queue.put(build_alert_embed(event, username, ban_data))
+        state_store.mark_alerted(username)
+    return event
+
+def record_worker_result(username, status, ban_data=None, user_id=None):
+    """Record a result reported by a shard worker, keeping the local ID and ban caches in step with it"""
+    if user_id is not None:
+        user_id_cache.set(username, user_id)
+        # Workers only send ban details when they fetched new ones
+        if status == STATUS_BANNED and ban_data:
+            roblox_client.ban_details.put(BanDetails.from_json(user_id, ban_data))
+        elif status == STATUS_ACTIVE:
+            roblox_client.ban_details.discard(user_id)
+    return record_status(username, status, ban_data, user_id)
+
+def record_worker_latency(total, count):
+    """Fold a shard worker's cycle latency into !stats, since the coordinator makes no checks itself"""
+    roster_stats.observe_latency(total / count)
+
+# Sharded mode: workers started with --worker connect here and check their share of the accounts
+coordinator = None
+if config.get("shard_port"):
+    coordinator = Coordinator(
+        record_worker_result,
+        host=config.get("shard_host", "127.0.0.1"),
+        port=config["shard_port"],
+        secret=config.get("shard_secret"),
+        heartbeat_timeout=config.get("shard_heartbeat_timeout", 30),
+        on_breaker_change=on_breaker_state_change,
+        on_latency=record_worker_latency
+    )
+
+async def check_account(semaphore, username, token, user_id, is_banned, report=record_status):
+    """
+    Handle the bulk-fetched status of a single account and pass it to `report`.
+    Returns (status, transition event); status is None if the check failed.
+    """
+    async with semaphore:
+        try:
+            status, ban_data = await asyncio.wait_for(
+                probe_account(username, token, user_id, is_banned),
+                timeout=config.get("account_check_timeout", 30)
+            )
+        except asyncio.TimeoutError:
+            logging.error(f"Timed out checking account {username}", extra={"account": username})
+            return None, None
+        except Exception as e:
+            logging.error(f"Error monitoring account {username}: {e}", extra={"account": username})
+            return None, None
+
+    if status is None:
+        return None, None
+
+    # Only alert when the account's status changed since the last check
+    return status, report(username, status, ban_data, user_id)
+
+async def probe_account(username, token, user_id, is_banned):
+    """
+    Work out the current status of one account.
+    Returns (status, ban details); status is None when it couldn't be determined.
+    """
+    if user_id is None:
+        return STATUS_NOT_FOUND, None
+
+    if is_banned is None:
+        logging.error(f"Error checking moderation status for {username}: no status returned", extra={"account": username})
+        return None, None
+
+    if not is_banned:
+        # Any later ban is a new one, so its details must be fetched again
+        roblox_client.ban_details.discard(user_id)
+        # The moderation lookup doesn't need the token, so check it separately;
+        # cached for validation_cache_ttl, so most cycles cost no request
+        is_valid = await check_credentials(username, token)
+        if is_valid is None:
+            return None, None
+        return (STATUS_ACTIVE if is_valid else STATUS_INVALID), None
+
+    # Get detailed ban information; cached until the ban's end date
+    try:
+        details = await roblox_client.get_ban_details(user_id, token)
+    except CircuitOpenError:
+        # Already announced once in the log channel; leave this check unknown
+        return None, None
+    except RobloxApiError as e:
+        logging.error(f"Error fetching ban details for {username}: {e}", extra={"account": username})
+        return None, None
+
+    if details is None:
+        return STATUS_INVALID, None
+    return STATUS_BANNED, details.raw
+
+def build_alert_embed(event, username, ban_data=None):
+    """Build the log channel embed for an account status transition"""
+    if event == EVENT_TOKEN_INVALID:
+        return discord.Embed(
+            title="Authorization Error",
+            description=f"Authorization invalid for account: {username}. Please update credentials.",
+            color=discord.Color.red()
+        )
+
+    if event == EVENT_NOT_FOUND:
+        return discord.Embed(
+            title="Account Not Found",
+            description=f"Account {username} not found.",
+            color=discord.Color.red()
+        )
+
+    if event == EVENT_UNBANNED:
+        return discord.Embed(
+            title="Unbanned!",
+            description=f"Account: {username}",
+            color=discord.Color.green()
+        )
+
+    embed = discord.Embed(
+        title="Ban extended!" if event == EVENT_BAN_EXTENDED else "Got banned!",
+        description=f"Account: {username}",
+        color=discord.Color.red()
+    )
+    ban_data = ban_data or {}
+    
+    # Add ban details
+    if "banEndDate" in ban_data:
+        embed.add_field(
+            name="Ban Length",
+            value=ban_data.get("banDuration", "Unknown"),
+            inline=True
+        )
+        embed.add_field(
+            name="Ban Ends",
+            value=ban_data.get("banEndDate", "Unknown"),
+            inline=True
+        )
+    
+    # Add game/place info if available
+    if "bannedFromPlace" in ban_data and ban_data["bannedFromPlace"]:
+        embed.add_field(
+            name="Banned From",
+            value=f"Place ID: {ban_data['bannedFromPlace']}",
+            inline=False
+        )
+    
+    # Add reason if available
+    if "reasonText" in ban_data:
+        embed.add_field(
+            name="Reason",
+            value=ban_data.get("reasonText", "No reason provided"),
+            inline=False
+        )
+    
+    return embed
+
+@tasks.loop(seconds=config.get("scheduler_tick", 10))
 async def monitor_accounts():
-    channel = bot.get_channel(config["log_channel_id"])
-    if not channel:
-        logging.error("Could not find log channel")
+    refresh_monitored_accounts()
+
+    # With shard workers connected, they do the checking and report back
+    if coordinator is not None:
+        coordinator.assign(accounts)
+        if coordinator.workers:
+            state_store.save()
+            user_id_cache.save()
+            roblox_client.ban_details.save()
+            roster_stats.save()
+            history.flush()
+            return
+
+    await run_monitor_cycle(accounts)
+
+async def run_monitor_cycle(monitored, report=record_status):
+    """Check the monitored accounts whose deadline has passed"""
+    # Accounts checked shortly before a restart keep their place in the cycle
+    scheduler.sync(list(monitored), last_checked=state_store.last_checked)
+    lag = scheduler.lag()
+    schedule_lag.set(lag)
+    snapshot = [(username, monitored[username]) for username in scheduler.pop_due()]
+    if not snapshot:
+        accounts_checked.set(0)
         return
+    
+    # Bound the number of accounts being probed at once
+    semaphore = asyncio.Semaphore(config.get("max_concurrent_checks", 10))
+    started = time.monotonic()
+    # Requests made during the cycle, including the bulk lookups, give !stats its latency
+    latency_before = request_latency.totals()
         
-    async with aiohttp.ClientSession() as session:
-        for username, token in accounts.items():
-            try:
-                headers = {
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/json"
-                }
-                
-                # First get user ID
-                async with session.post(
-                    "https://users.roblox.com/v1/usernames/users",
-                    headers=headers,
-                    json={"usernames": [username]}
-                ) as user_response:
-                    
-                    if user_response.status == 401:
-                        await channel.send(embed=discord.Embed(
-                            title="Authorization Error",
-                            description=f"Authorization invalid for account: {username}. Please update credentials.",
-                            color=discord.Color.red()
-                        ))
-                        continue
-                        
-                    if user_response.status == 200:
-                        user_data = await user_response.json()
-                        users = user_data["data"]
-                        
-                        if not users:
-                            await channel.send(embed=discord.Embed(
-                                title="Account Not Found",
-                                description=f"Account {username} not found.",
-                                color=discord.Color.red()
-                            ))
-                            continue
-                            
-                        user_id = users[0]["id"]
-                        
-                        # Check moderation status with detailed ban info
-                        async with session.get(
-                            f"https://users.roblox.com/v1/users/{user_id}",
-                            headers=headers
-                        ) as mod_response:
-                            
-                            if mod_response.status == 200:
-                                mod_data = await mod_response.json()
-                                is_banned = mod_data.get("isBanned", False)
-                                
-                                if is_banned:
-                                    # Get detailed ban information
-                                    async with session.get(
-                                        f"https://accountsettings.roblox.com/v1/users/{user_id}/ban-status",
-                                        headers=headers
-                                    ) as ban_response:
-                                        if ban_response.status == 200:
-                                            ban_data = await ban_response.json()
-                                            
-                                            embed = discord.Embed(
-                                                title="Got banned!",
-                                                description=f"Account: {username}",
-                                                color=discord.Color.red()
-                                            )
-                                            
-                                            # Add ban details
-                                            if "banEndDate" in ban_data:
-                                                embed.add_field(
-                                                    name="Ban Length",
-                                                    value=ban_data.get("banDuration", "Unknown"),
-                                                    inline=True
-                                                )
-                                                embed.add_field(
-                                                    name="Ban Ends",
-                                                    value=ban_data.get("banEndDate", "Unknown"),
-                                                    inline=True
-                                                )
-                                            
-                                            # Add game/place info if available
-                                            if "bannedFromPlace" in ban_data and ban_data["bannedFromPlace"]:
-                                                embed.add_field(
-                                                    name="Banned From",
-                                                    value=f"Place ID: {ban_data['bannedFromPlace']}",
-                                                    inline=False
-                                                )
-                                            
-                                            # Add reason if available
-                                            if "reasonText" in ban_data:
-                                                embed.add_field(
-                                                    name="Reason",
-                                                    value=ban_data.get("reasonText", "No reason provided"),
-                                                    inline=False
-                                                )
-                                            
-                                            await channel.send(embed=embed)
-                                else:
-                                    # Account is not banned, you might want to log this or handle differently
-                                    pass
-                            else:
-                                logging.error(f"Error checking moderation status for {username}: {mod_response.status}")
-                    
-            except Exception as e:
-                logging.error(f"Error monitoring account {username}: {e}")
+    # Resolve every user ID up front; cached IDs cost no requests
+    user_ids = await roblox_client.resolve_user_ids(username for username, _ in snapshot)
+    registry.set_user_ids(user_ids)
+
+    # Fetch ban flags for all resolved IDs in bulk, then fan out per account
+    statuses = await roblox_client.get_user_statuses(user_id for user_id in user_ids.values() if user_id)
+    ban_flags = {user_id: status.is_banned for user_id, status in statuses.items() if status.exists}
+    resolved = [(username, token) for username, token in snapshot if username in user_ids]
+    outcomes = await asyncio.gather(*(
+        check_account(
+            semaphore, username, token,
+            user_ids[username], ban_flags.get(user_ids[username]), report
+        )
+        for username, token in resolved
+    ))
+    state_store.save()
+    roster_stats.save()
+    history.flush()
+    roblox_client.ban_details.save()
+
+    # Pick each account's next deadline from what this check found
+    results = dict(zip([username for username, _ in resolved], outcomes))
+    for username, _ in snapshot:
+        status, event = results.get(username, (None, None))
+        ban_end = None
+        if status == STATUS_BANNED:
+            ban_end = parse_roblox_date(state_store.get(username).get("ban_end_date"))
+        scheduler.reschedule(username, succeeded=status is not None, changed=event is not None, ban_end=ban_end)
+        account_checks.inc(status=status or "unknown")
+
+    latency_sum, latency_count = request_latency.totals()
+    if latency_count > latency_before[1]:
+        roster_stats.observe_latency((latency_sum - latency_before[0]) / (latency_count - latency_before[1]))
+
+    elapsed = time.monotonic() - started
+    cycle_duration.observe(elapsed)
+    accounts_checked.set(len(snapshot))
+    logger.info(
+        f"Monitor checked {len(snapshot)} due accounts in {elapsed:.1f}s "
+        f"({len(scheduler)} scheduled, {lag:.0f}s behind schedule)"
+    )
+
+@tasks.loop(hours=24)
+async def compact_history():
+    """Downsample old history and drop what's past the retention period"""
+    now = time.time()
+    retention_days = config.get("history_retention_days")
+    merged, deleted = history.compact(
+        merge_before=now - config.get("history_merge_after_days", 30) * 86400,
+        delete_before=now - retention_days * 86400 if retention_days else None
+    )
+    if merged or deleted:
+        logger.info(f"Compacted history: merged {merged} run(s), deleted {deleted}")
 
 @bot.event
 async def on_ready():
+    global startup_validation
     logger.info(f'Bot is ready. Logged in as {bot.user.name}')
-    await validate_all_accounts()
+
+    # on_ready fires again after every reconnect; only run startup once
+    if startup_validation is None:
+        startup_seconds.set(time.monotonic() - PROCESS_STARTED)
+        logger.info(f"Startup took {time.monotonic() - PROCESS_STARTED:.1f}s")
+
+        # Validate in the background; commands answer from the saved state meanwhile
+        startup_validation = asyncio.create_task(validate_all_accounts())
+        show_panel()
+
+    await bot.change_presence(activity=discord.Activity(
+        type=discord.ActivityType.watching, 
+        name="Roblox accounts"
+    ))
     
-    # Clear screen after validation
+    alert_queue.start()
+    alert_delivery.start()
+    await metrics_server.start()
+    if coordinator is not None:
+        await coordinator.start()
+
+    if not compact_history.is_running():
+        compact_history.start()
+
+    # Check if monitor_accounts task is already running
+    if not monitor_accounts.is_running():
+        monitor_accounts.start()
+    else:
+        logger.info("Monitor task already running")
+
+def show_panel():
+    """Print the welcome panel to the console"""
     os.system('cls' if os.name == 'nt' else 'clear')
     
     # Show welcome message
@@ -170,23 +519,14 @@ async def on_ready():
     
     print("\nAvailable Commands:")
     print("!panel_help     - Show help message")
-    print("!list_accounts  - Show all monitored accounts")
+    print("!list_accounts  - Show all monitored accounts (--cached for last results)")
     print("!add_account    - Add a new account")
     print("!remove_account - Remove an account")
     print("!validate       - Check all accounts")
     print("!bancheck       - Check if a user is banned")
+    print("!history        - Show an account's status history")
+    print("!stats          - Show roster totals")
     print("!restart        - Restart the bot (Admin only)")
-    
-    await bot.change_presence(activity=discord.Activity(
-        type=discord.ActivityType.watching, 
-        name="Roblox accounts"
-    ))
-    
-    # Check if monitor_accounts task is already running
-    if not monitor_accounts.is_running():
-        monitor_accounts.start()
-    else:
-        logger.info("Monitor task already running")
 
 @bot.command(name='panel_help')
 async def panel_help_command(ctx):
@@ -199,11 +539,13 @@ async def panel_help_command(ctx):
     
     commands = {
         "!panel_help": "Show this help message",
-        "!list_accounts": "Show all monitored accounts",
+        "!list_accounts": "Show all monitored accounts\nUsage: !list_accounts [--cached]",
         "!add_account": "Add a new account\nUsage: !add_account username token",
         "!remove_account": "Remove an account\nUsage: !remove_account username",
         "!validate": "Check all accounts",
-        "!bancheck": "Check if a user is banned\nUsage: !bancheck username",
+        "!bancheck": "Check if users are banned\nUsage: !bancheck username [username ...]",
+        "!history": "Show an account's recorded status changes\nUsage: !history username [days]",
+        "!stats": "Show how many accounts are active, banned or invalid, from the monitor's running totals",
         "!restart": "Restart the bot (Admin only)"
     }
     
@@ -213,32 +555,39 @@ async def panel_help_command(ctx):
     await ctx.send(embed=embed)
 
 async def validate_all_accounts():
-    """Validate all accounts (main and additional)"""
+    """Validate all accounts (main and additional) concurrently"""
     roblox_config = Config.get_roblox_config()
     additional_accounts = Config.get_additional_accounts()
     
     logger.info(f"Starting validation of all accounts (Main + {len(additional_accounts)} additional)")
 
-    # Check main account
-    is_valid = await validate_credentials(roblox_config['username'], roblox_config['token'])
-    if is_valid:
-        logger.info(f"✅ Main account validated: {roblox_config['username']}")
-    else:
-        logger.error(f"❌ Main account failed: {roblox_config['username']}")
+    # Refresh the accounts watched by the monitor
+    refresh_monitored_accounts()
+    started = time.monotonic()
+    semaphore = asyncio.Semaphore(config.get("max_concurrent_checks", 10))
+
+    async def validate_one(username, token):
+        async with semaphore:
+            return await check_credentials(username, token)
 
-    # Check additional accounts
-    for username, token in additional_accounts.items():
-        is_valid = await validate_credentials(username, token)
-        if is_valid:
-            logger.info(f"✅ Additional account validated: {username}")
+    listed = list(accounts.items())
+    results = await asyncio.gather(
+        *(validate_one(username, token) for username, token in listed),
+        return_exceptions=True
+    )
+    for (username, _), is_valid in zip(listed, results):
+        kind = "Main account" if username == roblox_config['username'] else "Additional account"
+        if is_valid is True:
+            logger.debug(f"✅ {kind} validated: {username}", extra={"account": username})
         else:
-            logger.error(f"❌ Additional account failed: {username}")
+            logger.error(f"❌ {kind} failed: {username}", extra={"account": username})
+            if is_valid is False:
+                # A definite rejection; alert now rather than on the next monitor cycle
+                record_status(username, STATUS_INVALID)
 
-    await bot.change_presence(activity=discord.Activity(
-        type=discord.ActivityType.watching, 
-        name="Roblox accounts"
-    ))
-    monitor_accounts.start()
+    elapsed = time.monotonic() - started
+    validation_seconds.set(elapsed)
+    logger.info(f"Validated {len(listed)} account(s) in {elapsed:.1f}s")
 
 class AccountCommands(commands.Cog):
     def __init__(self, bot):
@@ -274,12 +623,10 @@ class AccountCommands(commands.Cog):
                 token = token.split('|_', 2)[-1]
             
             # Validate the credentials
-            is_valid = await validate_credentials(username, token)
+            is_valid = await validate_credentials(username, token, force=True)
             if is_valid:
                 # Add to additional accounts in config
-                additional_accounts = Config.get_additional_accounts()
-                additional_accounts[username] = token
-                if Config.save_additional_accounts(additional_accounts):
+                if Config.add_account(username, token):
                     embed = discord.Embed(
                         title="✅ Success",
                         description=f"Successfully added account: {username}",
@@ -322,85 +669,114 @@ class AccountCommands(commands.Cog):
             )
             await ctx.send(embed=embed)
 
+# How each monitor status is shown in cached account listings
+STATUS_LABELS = {
+    STATUS_ACTIVE: "✅ Active",
+    STATUS_BANNED: "🚫 Banned",
+    STATUS_INVALID: "❌ Invalid token",
+    STATUS_NOT_FOUND: "❓ Not found",
+}
+
+def format_age(seconds):
+    """Render a duration like 45s, 12m or 3h"""
+    if seconds < 60:
+        return f"{int(seconds)}s"
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)}h"
+    return f"{int(seconds // 86400)}d"
+
+def ban_end_text(user_id):
+    """When a ban ends according to the ban detail cache, or '' if its details aren't cached"""
+    details = roblox_client.ban_details.get(user_id) if user_id else None
+    if details is None:
+        return ""
+    expires_at = details.expires_at
+    return f" until <t:{int(expires_at)}:f>" if expires_at is not None else " permanently"
+
+def cached_account_line(username, label):
+    """Describe an account from the monitor's last result, without any Roblox calls"""
+    state = state_store.get(username)
+    if not state:
+        return f"❔ {username}{label} - Not checked yet"
+    status = STATUS_LABELS.get(state["status"], "Unknown")
+    if state["status"] == STATUS_BANNED:
+        status += ban_end_text(user_id_cache.get(username))
+    return f"{status} {username}{label} (checked {format_age(time.time() - state['last_checked'])} ago)"
+
+async def probe_listed_accounts(listed):
+    """Validate and status-check accounts concurrently, returning one line per account"""
+    semaphore = asyncio.Semaphore(config.get("max_concurrent_checks", 10))
+
+    # Resolve every listed username in one batched lookup
+    user_ids = await roblox_client.resolve_user_ids(username for username, _, _ in listed)
+
+    # Validate credentials for all accounts at once, bounded by the semaphore
+    async def validate_one(username, token):
+        async with semaphore:
+            return await validate_credentials(username, token)
+
+    results = await asyncio.gather(
+        *(validate_one(username, token) for username, token, _ in listed),
+        return_exceptions=True
+    )
+    valid = {username: result is True for (username, _, _), result in zip(listed, results)}
+
+    # Fetch ban status for all valid accounts in bulk
+    statuses = await roblox_client.get_user_statuses(
+        user_ids[username] for username, _, _ in listed
+        if valid[username] and user_ids.get(username)
+    )
+
+    account_list = []
+    for username, _, label in listed:
+        status = "✅" if valid[username] else "❌"
+        
+        ban_status = "Unknown"
+        user_status = statuses.get(user_ids.get(username)) if valid[username] else None
+        if user_status is not None and user_status.exists:
+            ban_status = f"🚫 Banned{ban_end_text(user_status.user_id)}" if user_status.is_banned else "✅ Active"
+        
+        account_list.append(f"{status} {username}{label} - {ban_status}")
+    return account_list
+
 @bot.command()
-async def list_accounts(ctx):
-    """List all registered accounts with ban status"""
+async def list_accounts(ctx, *flags):
+    """
+    List all registered accounts with ban status
+    Usage: !list_accounts [--cached]
+    """
     try:
-        # Force fresh data
-        Config.save_additional_accounts(Config.get_additional_accounts())
         roblox_config = Config.get_roblox_config()
         additional_accounts = Config.get_additional_accounts()
+        # Until startup validation finishes, answer from the saved state instead of probing
+        validating = startup_validation is not None and not startup_validation.done()
+        cached = "--cached" in flags or validating
         
         logger.info(f"Listing accounts - Main: {roblox_config['username']}, Additional: {len(additional_accounts)}")
-        account_list = []
 
-        async with aiohttp.ClientSession() as session:
-            # Check main account
-            if roblox_config['username'] and roblox_config['token']:
-                is_valid = await validate_credentials(roblox_config['username'], roblox_config['token'])
-                status = "✅" if is_valid else "❌"
-                
-                # Check ban status if valid
-                ban_status = "Unknown"
-                if is_valid:
-                    headers = {"Authorization": f"Bearer {roblox_config['token']}", "Accept": "application/json"}
-                    async with session.post(
-                        "https://users.roblox.com/v1/usernames/users",
-                        headers=headers,
-                        json={"usernames": [roblox_config['username']]}
-                    ) as response:
-                        if response.status == 200:
-                            user_data = await response.json()
-                            if user_data["data"]:
-                                user_id = user_data["data"][0]["id"]
-                                async with session.get(
-                                    f"https://users.roblox.com/v1/users/{user_id}",
-                                    headers=headers
-                                ) as mod_response:
-                                    if mod_response.status == 200:
-                                        mod_data = await mod_response.json()
-                                        ban_status = "🚫 Banned" if mod_data.get("isBanned", False) else "✅ Active"
-                
-                account_list.append(f"{status} {roblox_config['username']} (Main) - {ban_status}")
-
-            # Check additional accounts
-            for username, token in additional_accounts.items():
-                is_valid = await validate_credentials(username, token)
-                status = "✅" if is_valid else "❌"
-                
-                # Check ban status if valid
-                ban_status = "Unknown"
-                if is_valid:
-                    headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
-                    async with session.post(
-                        "https://users.roblox.com/v1/usernames/users",
-                        headers=headers,
-                        json={"usernames": [username]}
-                    ) as response:
-                        if response.status == 200:
-                            user_data = await response.json()
-                            if user_data["data"]:
-                                user_id = user_data["data"][0]["id"]
-                                async with session.get(
-                                    f"https://users.roblox.com/v1/users/{user_id}",
-                                    headers=headers
-                                ) as mod_response:
-                                    if mod_response.status == 200:
-                                        mod_data = await mod_response.json()
-                                        ban_status = "🚫 Banned" if mod_data.get("isBanned", False) else "✅ Active"
-                
-                account_list.append(f"{status} {username} - {ban_status}")
-
-        if account_list:
-            formatted_list = "\n".join(account_list)
-            embed = discord.Embed(
-                title="Registered Accounts",
-                description=formatted_list,
-                color=discord.Color.blue()
-            )
-            await ctx.send(embed=embed)
-        else:
+        listed = []
+        if roblox_config['username'] and roblox_config['token']:
+            listed.append((roblox_config['username'], roblox_config['token'], " (Main)"))
+        for username, token in additional_accounts.items():
+            listed.append((username, token, ""))
+
+        if not listed:
             await ctx.send("No accounts registered.")
+            return
+
+        if cached:
+            # Answer instantly from the monitor's last results
+            account_list = [cached_account_line(username, label) for username, _, label in listed]
+            title = "Registered Accounts (cached, startup validation running)" if validating else "Registered Accounts (cached)"
+        else:
+            async with ctx.typing():
+                account_list = await probe_listed_accounts(listed)
+            title = "Registered Accounts"
+
+        pages = build_pages(account_list, title, discord.Color.blue(), per_page=config.get("list_page_size", 20))
+        await send_pages(ctx, pages)
             
     except Exception as e:
         logger.error(f"Error listing accounts: {str(e)}")
@@ -424,9 +800,7 @@ async def remove_account(ctx, username: str = None):
     try:
         # Get both main and additional accounts
         roblox_config = Config.get_roblox_config()
-        additional_accounts = Config.get_additional_accounts()
         logger.info(f"Attempting to remove account: {username}")
-        logger.info(f"Current accounts: {list(additional_accounts.keys())}")
 
         # Check if trying to remove main account
         if username.lower() == roblox_config['username'].lower():
@@ -439,38 +813,8 @@ async def remove_account(ctx, username: str = None):
             return
 
         # Check additional accounts (case-insensitive)
-        account_found = False
-        for acc_name in list(additional_accounts.keys()):
-            if acc_name.lower() == username.lower():
-                del additional_accounts[acc_name]
-                logger.info(f"Removed account from dictionary: {acc_name}")
-                
-                # Save updated accounts
-                if Config.save_additional_accounts(additional_accounts):
-                    logger.info("Successfully saved updated accounts")
-                    embed = discord.Embed(
-                        title="✅ Success",
-                        description=f"Successfully removed account: {acc_name}",
-                        color=discord.Color.green()
-                    )
-                    await ctx.send(embed=embed)
-                    
-                    # Force reload accounts and show updated list
-                    additional_accounts = Config.get_additional_accounts()
-                    logger.info(f"Updated accounts list: {list(additional_accounts.keys())}")
-                    await list_accounts(ctx)
-                    return
-                else:
-                    logger.error("Failed to save account changes")
-                    embed = discord.Embed(
-                        title="❌ Error",
-                        description="Failed to save account changes.",
-                        color=discord.Color.red()
-                    )
-                    await ctx.send(embed=embed)
-                    return
-
-        if not account_found:
+        found = registry.find(username)
+        if found is None:
             logger.warning(f"Account not found: {username}")
             embed = discord.Embed(
                 title="❌ Error",
@@ -478,6 +822,30 @@ async def remove_account(ctx, username: str = None):
                 color=discord.Color.red()
             )
             await ctx.send(embed=embed)
+            return
+
+        acc_name, _ = found
+        
+        # Delete it from the account store
+        if Config.remove_account(acc_name):
+            logger.info(f"Removed account: {acc_name}")
+            embed = discord.Embed(
+                title="✅ Success",
+                description=f"Successfully removed account: {acc_name}",
+                color=discord.Color.green()
+            )
+            await ctx.send(embed=embed)
+            
+            # Show updated list
+            await list_accounts(ctx)
+        else:
+            logger.error("Failed to save account changes")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Failed to save account changes.",
+                color=discord.Color.red()
+            )
+            await ctx.send(embed=embed)
             
     except Exception as e:
         logger.error(f"Error removing account: {str(e)}")
@@ -548,7 +916,9 @@ async def validate(ctx):
 
         # Validate main account
         logger.info("Validating main account...")
-        is_valid = await validate_credentials(roblox_config['username'], roblox_config['token'])
+        is_valid = await check_credentials(roblox_config['username'], roblox_config['token'], force=True)
+        if is_valid is False:
+            record_status(roblox_config['username'], STATUS_INVALID)
         status = "✅" if is_valid else "❌"
         validation_results.append(f"{status} {roblox_config['username']} (Main)")
 
@@ -556,7 +926,9 @@ async def validate(ctx):
         if additional_accounts:
             logger.info(f"Validating {len(additional_accounts)} additional accounts...")
             for username, token in additional_accounts.items():
-                is_valid = await validate_credentials(username, token)
+                is_valid = await check_credentials(username, token, force=True)
+                if is_valid is False:
+                    record_status(username, STATUS_INVALID)
                 status = "✅" if is_valid else "❌"
                 validation_results.append(f"{status} {username}")
 
@@ -586,100 +958,219 @@ async def validate(ctx):
         )
         await ctx.send(embed=embed)
 
+# Recent !checkban results keyed by lowercase username
+checkban_cache = LRUCache(
+    maxsize=config.get("checkban_cache_size", 1000),
+    ttl=config.get("checkban_cache_ttl", 60)
+)
+
+# Lookups currently in flight, shared by concurrent checks of the same name
+checkban_flight = SingleFlight()
+
+# Export hit rates of the caches in front of Roblox
+track_caches({
+    "validation": validation_cache,
+    "checkban": checkban_cache,
+    "csrf": roblox_client.csrf_tokens,
+    "ban_details": roblox_client.ban_details,
+})
+
+# Most names accepted by a single !checkban
+CHECKBAN_MAX_NAMES = 100
+
+async def fetch_ban_statuses(usernames):
+    """
+    Look up ban status for usernames with one batched resolve and one bulk flag fetch.
+    Returns {lowercase username: {"user_id", "is_banned"} or None if the user doesn't exist};
+    names whose lookup failed are left out.
+    """
+    user_ids = await roblox_client.resolve_user_ids(usernames)
+    statuses = await roblox_client.get_user_statuses(user_id for user_id in user_ids.values() if user_id)
+
+    results = {}
+    for username in usernames:
+        if username not in user_ids:
+            continue
+        user_id = user_ids[username]
+        if user_id is None or (user_id in statuses and not statuses[user_id].exists):
+            results[username.lower()] = None
+        elif user_id in statuses:
+            results[username.lower()] = {"user_id": user_id, "is_banned": statuses[user_id].is_banned}
+        else:
+            continue
+        checkban_cache.set(username.lower(), results[username.lower()])
+    return results
+
+async def lookup_ban_statuses(usernames):
+    """Answer from the cache where possible and share in-flight lookups for the rest"""
+    results = {}
+    tasks = {}
+    new = []
+    for username in usernames:
+        key = username.lower()
+        cached = checkban_cache.get(key, MISSING)
+        if cached is not MISSING:
+            results[key] = cached
+        elif checkban_flight.get(key) is not None:
+            tasks[key] = checkban_flight.get(key)
+        else:
+            new.append(username)
+
+    # One batched lookup covers every name nobody else is already fetching
+    if new:
+        task = checkban_flight.run([username.lower() for username in new], fetch_ban_statuses(new))
+        for username in new:
+            tasks[username.lower()] = task
+
+    for task in set(tasks.values()):
+        fetched = await checkban_flight.wait(task)
+        for key, shared_task in tasks.items():
+            if shared_task is task and key in fetched:
+                results[key] = fetched[key]
+    return results
+
+def ban_status_embed(username, result):
+    """Build the detailed embed for a single checked user"""
+    if result["is_banned"]:
+        embed = discord.Embed(
+            title="Ban Status",
+            description=f"User: {username}",
+            color=discord.Color.red()
+        )
+        embed.add_field(
+            name="Status",
+            value="🚫 Banned",
+            inline=False
+        )
+
+        # Monitored accounts have their ban details cached
+        details = roblox_client.ban_details.get(result["user_id"])
+        if details is not None:
+            embed.add_field(
+                name="Ban Ends",
+                value=f"<t:{int(details.expires_at)}:f>" if details.expires_at is not None else "Never",
+                inline=True
+            )
+            embed.add_field(
+                name="Reason",
+                value=details.reason_text or "No reason provided",
+                inline=True
+            )
+        
+        # Add appeal information if configured
+        if "appeal_url" in config:
+            embed.add_field(
+                name="Appeal Information",
+                value=f"To appeal this ban, visit: {config['appeal_url']}",
+                inline=False
+            )
+    else:
+        embed = discord.Embed(
+            title="Ban Status",
+            description=f"User: {username}",
+            color=discord.Color.green()
+        )
+        embed.add_field(
+            name="Status",
+            value="✅ Not Banned",
+            inline=False
+        )
+    return embed
+
+def ban_status_line(username, result):
+    """Describe one user in a multi-name !checkban listing"""
+    if username.lower() not in result:
+        return f"⚠️ {username} - Lookup failed"
+    status = result[username.lower()]
+    if status is None:
+        return f"❓ {username} - Not found"
+    if status["is_banned"]:
+        return f"🚫 {username} - Banned{ban_end_text(status['user_id'])}"
+    return f"✅ {username} - Not Banned"
+
 @bot.command(aliases=['bancheck', 'checkstatus', 'checkban'])
-async def check_ban(ctx, username: str = None):
-    """Check ban status for a Roblox user"""
-    if not username:
+async def check_ban(ctx, *usernames):
+    """
+    Check ban status for one or more Roblox users
+    Usage: !checkban <username> [username ...]
+    """
+    if not usernames:
+        embed = discord.Embed(
+            title="❌ Error",
+            description="Please provide a username.\nUsage: `!checkban <username> [username ...]`",
+            color=discord.Color.red()
+        )
+        await ctx.send(embed=embed)
+        return
+
+    usernames = list(dict.fromkeys(usernames))
+    if len(usernames) > CHECKBAN_MAX_NAMES:
         embed = discord.Embed(
             title="❌ Error",
-            description="Please provide a username.\nUsage: `!checkban <username>`",
+            description=(
+                f"Too many usernames: {len(usernames)} given, at most {CHECKBAN_MAX_NAMES} per command.\n"
+                "Usage: `!checkban <username> [username ...]`"
+            ),
             color=discord.Color.red()
         )
         await ctx.send(embed=embed)
         return
 
+    private = "private_ban_checks" in config and config["private_ban_checks"]
+
     try:
-        async with aiohttp.ClientSession() as session:
-            # First get user ID
-            async with session.post(
-                "https://users.roblox.com/v1/usernames/users",
-                json={"usernames": [username]}
-            ) as response:
-                if response.status == 200:
-                    user_data = await response.json()
-                    users = user_data["data"]
-                    
-                    if not users:
-                        embed = discord.Embed(
-                            title="User Not Found",
-                            description=f"Could not find user: {username}",
-                            color=discord.Color.red()
-                        )
-                        await ctx.send(embed=embed)
-                        return
+        results = await lookup_ban_statuses(usernames)
+
+        if len(usernames) > 1:
+            lines = [ban_status_line(username, results) for username in usernames]
+            pages = build_pages(lines, "Ban Status", discord.Color.blue())
+            if private:
+                try:
+                    await send_pages(ctx, pages, destination=ctx.author)
+                    await ctx.message.add_reaction('✅')
+                except discord.Forbidden:
+                    await ctx.send("❌ Could not send DM. Please enable DMs from server members.")
+            else:
+                await send_pages(ctx, pages)
+            return
+
+        username = usernames[0]
+        if username.lower() not in results:
+            raise Exception(f"Ban status lookup failed for {username}")
+        
+        result = results[username.lower()]
+        if result is None:
+            embed = discord.Embed(
+                title="User Not Found",
+                description=f"Could not find user: {username}",
+                color=discord.Color.red()
+            )
+            await ctx.send(embed=embed)
+            return
+
+        embed = ban_status_embed(username, result)
+
+        # Notify moderators about potential appeal
+        if result["is_banned"] and "appeal_url" in config and "mod_role_id" in config and ctx.guild:
+            mod_role = ctx.guild.get_role(config["mod_role_id"])
+            if mod_role:
+                appeal_embed = discord.Embed(
+                    title="Ban Appeal Available",
+                    description=f"Ban appeal available for {username}. Please review.",
+                    color=discord.Color.blue()
+                )
+                await ctx.send(content=mod_role.mention, embed=appeal_embed)
+        
+        # Send result as DM if configured
+        if private:
+            try:
+                await ctx.author.send(embed=embed)
+                await ctx.message.add_reaction('✅')
+            except discord.Forbidden:
+                await ctx.send("❌ Could not send DM. Please enable DMs from server members.")
+        else:
+            await ctx.send(embed=embed)
                         
-                    user_id = users[0]["id"]
-                    
-                    # Check moderation status
-                    async with session.get(
-                        f"https://users.roblox.com/v1/users/{user_id}"
-                    ) as mod_response:
-                        if mod_response.status == 200:
-                            mod_data = await mod_response.json()
-                            is_banned = mod_data.get("isBanned", False)
-                            
-                            if is_banned:
-                                embed = discord.Embed(
-                                    title="Ban Status",
-                                    description=f"User: {username}",
-                                    color=discord.Color.red()
-                                )
-                                embed.add_field(
-                                    name="Status",
-                                    value="🚫 Banned",
-                                    inline=False
-                                )
-                                
-                                # Add appeal information if configured
-                                if "appeal_url" in config:
-                                    embed.add_field(
-                                        name="Appeal Information",
-                                        value=f"To appeal this ban, visit: {config['appeal_url']}",
-                                        inline=False
-                                    )
-                                    
-                                    # Notify moderators about potential appeal
-                                    if "mod_role_id" in config:
-                                        mod_role = ctx.guild.get_role(config["mod_role_id"])
-                                        if mod_role:
-                                            appeal_embed = discord.Embed(
-                                                title="Ban Appeal Available",
-                                                description=f"Ban appeal available for {username}. Please review.",
-                                                color=discord.Color.blue()
-                                            )
-                                            await ctx.send(content=mod_role.mention, embed=appeal_embed)
-                            else:
-                                embed = discord.Embed(
-                                    title="Ban Status",
-                                    description=f"User: {username}",
-                                    color=discord.Color.green()
-                                )
-                                embed.add_field(
-                                    name="Status",
-                                    value="✅ Not Banned",
-                                    inline=False
-                                )
-                            
-                            # Send result as DM if configured
-                            if "private_ban_checks" in config and config["private_ban_checks"]:
-                                try:
-                                    await ctx.author.send(embed=embed)
-                                    await ctx.message.add_reaction('✅')
-                                except discord.Forbidden:
-                                    await ctx.send("❌ Could not send DM. Please enable DMs from server members.")
-                            else:
-                                await ctx.send(embed=embed)
-                                
     except Exception as e:
         logger.error(f"Error checking ban status: {str(e)}")
         embed = discord.Embed(
@@ -689,19 +1180,115 @@ async def check_ban(ctx, username: str = None):
         )
         await ctx.send(embed=embed)
 
+def history_line(run):
+    """Describe one run of identical observations"""
+    status = STATUS_LABELS.get(run["status"], "Unknown")
+    if run["status"] == STATUS_BANNED:
+        status += f" until <t:{int(run['ban_end'])}:f>" if run["ban_end"] is not None else " permanently"
+    started, last_seen = int(run["started"]), int(run["last_seen"])
+    return (
+        f"{status} - <t:{started}:f> → <t:{last_seen}:f> "
+        f"({format_age(last_seen - started)}, {run['samples']} check(s))"
+    )
+
+def last_ban_text(runs):
+    """When the newest ban in `runs` (newest first) started and how long it lasted"""
+    ban_start = ban_stop = None
+    for index, run in enumerate(runs):
+        if run["status"] == STATUS_BANNED:
+            ban_start = run["started"]
+            if ban_stop is None:
+                ban_stop = runs[index - 1]["started"] if index > 0 else None
+        elif ban_start is not None:
+            break
+    if ban_start is None:
+        return "No bans recorded"
+    if ban_stop is None:
+        return f"Banned since <t:{int(ban_start)}:f> ({format_age(time.time() - ban_start)} so far)"
+    return f"Last banned <t:{int(ban_start)}:f> for {format_age(ban_stop - ban_start)}"
+
+@bot.command(name='history')
+async def history_command(ctx, username: str = None, days: int = None):
+    """
+    Show the recorded status history of an account
+    Usage: !history <username> [days]
+    """
+    if not username:
+        await ctx.send("❌ Usage: `!history <username> [days]`")
+        return
+
+    try:
+        user_ids = await roblox_client.resolve_user_ids([username])
+        user_id = user_ids.get(username)
+        if user_id is None:
+            await ctx.send(f"❌ Could not find user: {username}")
+            return
+
+        since = time.time() - days * 86400 if days else None
+        runs = history.runs(user_id, since=since, limit=config.get("history_limit", 200))
+        if not runs:
+            await ctx.send(f"No history recorded for {username}.")
+            return
+
+        lines = [last_ban_text(runs), ""] + [history_line(run) for run in runs]
+        title = f"History for {username}" + (f" (last {days} days)" if days else "")
+        await send_pages(ctx, build_pages(lines, title, discord.Color.blue()))
+    except Exception as e:
+        logger.error(f"Error showing history for {username}: {str(e)}")
+        await ctx.send("❌ An error occurred while loading the history.")
+
+@bot.command(name='stats')
+async def stats_command(ctx):
+    """
+    Show roster totals kept by the monitor, without contacting Roblox
+    Usage: !stats
+    """
+    refresh_monitored_accounts()
+    summary = roster_stats.summary()
+    counts = summary["counts"]
+    unchecked = max(len(accounts) - len(roster_stats), 0)
+
+    embed = discord.Embed(title="Roster Stats", color=discord.Color.blue())
+    embed.add_field(name="Accounts", value=str(len(accounts)), inline=True)
+    for status, label in STATUS_LABELS.items():
+        embed.add_field(name=label, value=str(counts.get(status, 0)), inline=True)
+    if unchecked:
+        embed.add_field(name="❔ Not checked yet", value=str(unchecked), inline=True)
+    embed.add_field(name="New bans (24h / 7d)", value=f"{summary['bans_24h']} / {summary['bans_7d']}", inline=False)
+
+    mean_ban = summary["mean_ban_duration"]
+    embed.add_field(
+        name="Mean ban duration",
+        value=f"{format_age(mean_ban)} over {summary['completed_bans']} lifted ban(s)" if mean_ban is not None else "No bans lifted yet",
+        inline=True
+    )
+    latency = summary["check_latency"]
+    embed.add_field(
+        name="Average request latency",
+        value=f"{latency * 1000:.0f} ms" if latency is not None else "No checks yet",
+        inline=True
+    )
+    await ctx.send(embed=embed)
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Roblox Account Manager')
     parser.add_argument('--check', action='store_true', help='Check account status')
     parser.add_argument('--validate', action='store_true', help='Validate credentials')
     parser.add_argument('--account', type=str, help='Specific account to check (from additional accounts)')
+    parser.add_argument('--worker', type=str, metavar='ID', help='Run as a shard worker with this ID instead of the bot')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT', help="Serve a shard worker's own metrics on PORT")
+    parser.add_argument('--batch', type=str, metavar='FILE', help='Check usernames or user IDs listed in FILE ("-" for stdin) and print NDJSON results, without Discord')
+    parser.add_argument('--checkpoint', type=str, metavar='FILE', help='Save batch progress to FILE and resume from it')
+    parser.add_argument('--concurrency', type=int, default=4, help='Batch chunks checked at once')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Lines per batch chunk')
     return parser.parse_args()
 
-def check_single_account(username, token, platform_config):
+async def check_single_account(username, token, platform_config):
     """Check status for a single account"""
     logger.info(f"Processing account: {username}")
     
-    if validate_credentials(username, token):
-        status = check_account_status(
+    if await validate_credentials(username, token):
+        status = await check_account_status(
             platform="roblox",
             username=username,
             token=token,
@@ -749,7 +1336,7 @@ async def main():
                 logger.info("Main account validation successful")
 
         # Process additional accounts
-        if additional_accounts and not args.account:
+        if additional_accounts and (args.check or args.validate):
             logger.info(f"Processing {len(additional_accounts)} additional accounts...")
             for username, token in additional_accounts.items():
                 is_valid = await validate_credentials(username, token)
@@ -764,6 +1351,85 @@ async def main():
         logger.error(f"An error occurred: {str(e)}")
         logger.error(traceback.format_exc())
         raise
+    finally:
+        # The bot runs in a fresh event loop, so release this loop's connections
+        await http_client.close()
+
+async def run_shard_worker(worker_id, metrics_port=None):
+    """Check this worker's share of the accounts and report every result to the coordinator"""
+    global state_store, roster_stats, user_id_cache
+    # Local state only steers scheduling and ban detail fetches; the coordinator keeps the real one
+    base, ext = os.path.splitext(config.get("state_file", "account_state.json"))
+    state_store = StateStore(f"{base}.{worker_id}{ext}")
+    base, ext = os.path.splitext(config.get("stats_file", "roster_stats.json"))
+    roster_stats = RosterStats(f"{base}.{worker_id}{ext}")
+    base, ext = os.path.splitext(config.get("ban_details_file", "ban_details.json"))
+    roblox_client.ban_details = BanDetailCache(f"{base}.{worker_id}{ext}")
+    # Resolving saves the ID cache, so sharing the coordinator's file would race with its writes
+    base, ext = os.path.splitext(config.get("user_id_cache_file", "user_ids.json"))
+    user_id_cache = UserIdCache(f"{base}.{worker_id}{ext}")
+    roblox_client.user_id_cache = user_id_cache
+
+    worker = ShardWorker(
+        worker_id,
+        host=config.get("shard_host", "127.0.0.1"),
+        port=config.get("shard_port", 8765),
+        secret=config.get("shard_secret"),
+        heartbeat_interval=config.get("shard_heartbeat_interval", 10)
+    )
+    # Breaker alerts go out from the coordinator, which owns the alert queue
+    http_client.breakers.on_state_change = worker.send_breaker_change
+
+    def report(username, status, ban_data, user_id):
+        ban_end_date = ban_data.get("banEndDate") if ban_data else None
+        event = state_store.record(username, status, ban_end_date)
+        worker.send_result(username, status, ban_data, user_id)
+        return event
+
+    # Request and cycle metrics are recorded where the checks run, so each worker serves its own
+    worker_metrics = MetricsServer(host=config.get("metrics_host", "127.0.0.1"), port=metrics_port)
+    await worker_metrics.start()
+
+    worker.start()
+    logger.info(f"Shard worker {worker_id} started")
+    try:
+        while True:
+            owned = dict(worker.assigned)
+            latency_before = request_latency.totals()
+            try:
+                await run_monitor_cycle(owned, report)
+            except Exception as e:
+                logger.error(f"Error in shard worker cycle: {e}")
+            # The coordinator keeps the latency average shown by !stats
+            latency_sum, latency_count = request_latency.totals()
+            if latency_count > latency_before[1]:
+                worker.send_latency(latency_sum - latency_before[0], latency_count - latency_before[1])
+            state_store.save()
+            await asyncio.sleep(config.get("scheduler_tick", 10))
+    finally:
+        await worker.stop()
+        await worker_metrics.stop()
+        state_store.save()
+        await http_client.close()
+
+async def run_batch(args):
+    """Headless batch check of a username/user ID list, streaming NDJSON to stdout"""
+    # Keep audit lists out of the bot's persistent user ID cache
+    client = RobloxClient(user_id_cache=UserIdCache(None))
+    try:
+        if args.batch == "-":
+            await run_batch_check(
+                client, sys.stdin, source="-", checkpoint_path=args.checkpoint,
+                concurrency=args.concurrency, chunk_size=args.chunk_size
+            )
+        else:
+            with open(args.batch, 'r', encoding='utf-8') as f:
+                await run_batch_check(
+                    client, f, source=os.path.abspath(args.batch), checkpoint_path=args.checkpoint,
+                    concurrency=args.concurrency, chunk_size=args.chunk_size
+                )
+    finally:
+        await http_client.close()
 
 async def setup():
     await bot.add_cog(AccountCommands(bot))
@@ -781,10 +1447,29 @@ if __name__ == "__main__":
             socket.setdefaulttimeout(30)
             socket.getaddrinfo('discord.com', 443)  # Pre-resolve DNS
         
-        # Start bot
-        asyncio.run(main())
+        # Shard workers only check accounts; the coordinator talks to Discord
+        args = parse_arguments()
+        if args.worker:
+            try:
+                asyncio.run(run_shard_worker(args.worker, args.metrics_port))
+            except KeyboardInterrupt:
+                logger.info("Shard worker stopped")
+            sys.exit(0)
+
+        # Batch audits never touch Discord
+        if args.batch:
+            try:
+                asyncio.run(run_batch(args))
+            except KeyboardInterrupt:
+                logger.info("Batch check interrupted; rerun with the same --checkpoint to resume")
+            sys.exit(0)
+
+        # Command-line checks run before the bot; a plain start connects straight away
+        if args.check or args.validate or args.account:
+            asyncio.run(main())
         asyncio.run(setup()) 
-        bot.run(discord_token)
+        # Route discord.py's logs through the same queued handler
+        bot.run(discord_token, log_handler=None)
         
     except socket.gaierror:
         logger.error("DNS resolution failed. Please check your internet connection or DNS settings.")
@@ -0,0 +1,139 @@
+import time
+import sqlite3
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    username TEXT NOT NULL PRIMARY KEY COLLATE NOCASE,
+    token TEXT NOT NULL,
+    user_id INTEGER,
+    added_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_accounts_user_id ON accounts(user_id);
+"""
+
+
+class AccountStore:
+    """
+    SQLite-backed store of additional accounts.
+    Usernames are unique case-insensitively and every write is its own
+    transaction, so concurrent adds and removes can't lose each other.
+    """
+
+    def __init__(self, path='accounts.db'):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+        # Mirror of the table so reads never touch the disk
+        self._accounts = {}
+        self._by_lower = {}
+        self._user_ids = {}
+        self._by_user_id = {}
+        for username, token, user_id in self._conn.execute("SELECT username, token, user_id FROM accounts"):
+            self._remember(username, token, user_id)
+        logger.info(f"Loaded {len(self._accounts)} accounts from {path}")
+
+    def _remember(self, username, token, user_id=None):
+        self._forget(username)
+        self._accounts[username] = token
+        self._by_lower[username.lower()] = username
+        if user_id is not None:
+            self._user_ids[username] = user_id
+            self._by_user_id[user_id] = username
+
+    def _forget(self, username):
+        stored = self._by_lower.pop(username.lower(), None)
+        if stored is None:
+            return None
+        token = self._accounts.pop(stored)
+        user_id = self._user_ids.pop(stored, None)
+        if user_id is not None:
+            self._by_user_id.pop(user_id, None)
+        return stored, token
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def all(self):
+        return dict(self._accounts)
+
+    def get(self, username):
+        """Case-insensitive lookup returning (stored username, token) or None"""
+        stored = self._by_lower.get(username.lower())
+        if stored is None:
+            return None
+        return stored, self._accounts[stored]
+
+    def get_by_user_id(self, user_id):
+        """Look up an account by Roblox user ID, returning (username, token) or None"""
+        username = self._by_user_id.get(user_id)
+        if username is None:
+            return None
+        return username, self._accounts[username]
+
+    def add(self, username, token, user_id=None):
+        """Insert or update a single account"""
+        previous = self.get(username)
+        if previous is not None and user_id is None:
+            user_id = self._user_ids.get(previous[0])
+        with self._conn:
+            self._conn.execute("DELETE FROM accounts WHERE username = ?", (username,))
+            self._conn.execute(
+                "INSERT INTO accounts (username, token, user_id, added_at) VALUES (?, ?, ?, ?)",
+                (username, token, user_id, time.time())
+            )
+        self._remember(username, token, user_id)
+
+    def add_many(self, accounts):
+        """Insert or update several accounts in one transaction"""
+        with self._conn:
+            for username, token in accounts.items():
+                self._conn.execute("DELETE FROM accounts WHERE username = ?", (username,))
+                self._conn.execute(
+                    "INSERT INTO accounts (username, token, added_at) VALUES (?, ?, ?)",
+                    (username, token, time.time())
+                )
+        for username, token in accounts.items():
+            self._remember(username, token)
+
+    def remove(self, username):
+        """Delete an account; returns the stored username, or None if it wasn't found"""
+        with self._conn:
+            deleted = self._conn.execute("DELETE FROM accounts WHERE username = ?", (username,)).rowcount
+        forgotten = self._forget(username)
+        return forgotten[0] if deleted and forgotten else None
+
+    def replace_all(self, accounts):
+        """Make the store hold exactly the given accounts"""
+        with self._conn:
+            self._conn.execute("DELETE FROM accounts")
+            self._conn.executemany(
+                "INSERT INTO accounts (username, token, user_id, added_at) VALUES (?, ?, ?, ?)",
+                [(username, token, self._user_ids.get(username), time.time()) for username, token in accounts.items()]
+            )
+        user_ids = dict(self._user_ids)
+        self._accounts, self._by_lower, self._user_ids, self._by_user_id = {}, {}, {}, {}
+        for username, token in accounts.items():
+            self._remember(username, token, user_ids.get(username))
+
+    def set_user_ids(self, user_ids):
+        """Record resolved Roblox user IDs for accounts that don't have one yet"""
+        updates = []
+        for username, user_id in user_ids.items():
+            stored = self._by_lower.get(username.lower())
+            if stored is not None and user_id is not None and self._user_ids.get(stored) != user_id:
+                updates.append((user_id, stored))
+        if not updates:
+            return
+        with self._conn:
+            self._conn.executemany("UPDATE accounts SET user_id = ? WHERE username = ?", updates)
+        for user_id, stored in updates:
+            self._remember(stored, self._accounts[stored], user_id)
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import discord
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Discord embed limits
+EMBED_FIELD_LIMIT = 25
+EMBED_CHAR_LIMIT = 6000
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+EMBEDS_PER_MESSAGE = 10
+
+# Room kept free in each digest for its title and footer
+DIGEST_HEADER_RESERVE = 200
+
+
+def truncate(text, limit):
+    text = str(text)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def summarize(embed):
+    """Condense an alert embed into a single digest field"""
+    name = embed.title or "Alert"
+    if embed.description:
+        name = f"{name} — {embed.description}"
+    value = "\n".join(f"{field.name}: {field.value}" for field in embed.fields) or "\u200b"
+    return truncate(name, FIELD_NAME_LIMIT), truncate(value, FIELD_VALUE_LIMIT)
+
+
+def build_digests(embeds, title="Account alerts"):
+    """Merge alert embeds into as few digest embeds as Discord's limits allow"""
+    pages = [[]]
+    size = 0
+    for embed in embeds:
+        name, value = summarize(embed)
+        field_size = len(name) + len(value)
+        if len(pages[-1]) == EMBED_FIELD_LIMIT or size + field_size > EMBED_CHAR_LIMIT - DIGEST_HEADER_RESERVE:
+            pages.append([])
+            size = 0
+        pages[-1].append((name, value))
+        size += field_size
+
+    digests = []
+    for page_number, fields in enumerate(pages, start=1):
+        digest = discord.Embed(
+            title=f"{title} ({len(embeds)})",
+            color=discord.Color.orange()
+        )
+        for name, value in fields:
+            digest.add_field(name=name, value=value, inline=False)
+        if len(pages) > 1:
+            digest.set_footer(text=f"Page {page_number}/{len(pages)}")
+        digests.append(digest)
+    return digests
+
+
+def pack_messages(embeds):
+    """Group embeds into messages within Discord's per-message embed and character limits"""
+    messages = [[]]
+    size = 0
+    for embed in embeds:
+        if messages[-1] and (len(messages[-1]) == EMBEDS_PER_MESSAGE or size + len(embed) > EMBED_CHAR_LIMIT):
+            messages.append([])
+            size = 0
+        messages[-1].append(embed)
+        size += len(embed)
+    return messages
+
+
+class AlertQueue:
+    """
+    Buffers outbound alerts and sends them from a background task.
+    Alerts arriving within `window` seconds of each other are merged into
+    digest embeds, so bursts cost a handful of messages instead of one each.
+    Each message is handed to `deliver` as a list of embed dicts.
+    """
+
+    def __init__(self, deliver, window=5.0, max_size=10000):
+        self.deliver = deliver
+        self.window = window
+        self.max_size = max_size
+        self._queue = None
+        self._task = None
+        self._batch = []
+
+    def _ensure_queue(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+        return self._queue
+
+    def __len__(self):
+        return (self._queue.qsize() if self._queue else 0) + len(self._batch)
+
+    def put(self, embed):
+        """Queue an alert without waiting for it to be sent"""
+        try:
+            self._ensure_queue().put_nowait(embed)
+        except asyncio.QueueFull:
+            logger.error(f"Alert queue full, dropping alert: {embed.title}")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._ensure_queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the sender and flush anything still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        pending = self._batch
+        self._batch = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            await self._send(pending)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = [await self._queue.get()]
+
+            # Keep collecting until the window closes
+            deadline = loop.time() + self.window
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            while not self._queue.empty():
+                self._batch.append(self._queue.get_nowait())
+
+            batch = self._batch
+            self._batch = []
+            await self._send(batch)
+
+    async def _send(self, embeds):
+        digests = embeds if len(embeds) == 1 else build_digests(embeds)
+        try:
+            for message in pack_messages(digests):
+                self.deliver([embed.to_dict() for embed in message])
+        except Exception as e:
+            logger.error(f"Error queueing {len(embeds)} alert(s) for delivery: {e}")
@@ -0,0 +1,156 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+
+from utils.state_store import STATUS_ACTIVE, STATUS_BANNED, STATUS_NOT_FOUND
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Batch-only result for lines whose lookup failed; never stored as an account status
+STATUS_UNKNOWN = "unknown"
+
+
+def parse_target(line):
+    """A numeric line is a user ID, anything else a username"""
+    return ("user_id", int(line)) if line.isdigit() else ("username", line)
+
+
+def read_targets(stream, skip=0):
+    """Yield (entry number, line) for non-empty, non-comment lines, after skipping the first `skip` entries"""
+    number = 0
+    for raw in stream:
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        number += 1
+        if number <= skip:
+            continue
+        yield number, line
+
+
+def chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Checkpoint:
+    """How many input lines have been written out, saved atomically so a rerun can resume"""
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+        self.offset = 0
+
+    def load(self):
+        if not self.path:
+            return 0
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading checkpoint {self.path}, starting over: {e}")
+            return 0
+        if saved.get("source") != self.source:
+            logger.warning(f"Checkpoint {self.path} belongs to {saved.get('source')}, starting over")
+            return 0
+        self.offset = int(saved.get("offset", 0))
+        return self.offset
+
+    def save(self, offset):
+        self.offset = offset
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"source": self.source, "offset": offset, "updated": time.time()}, f)
+        os.replace(tmp_path, self.path)
+
+
+async def check_chunk(client, chunk):
+    """Resolve and status-check one chunk with batched lookups, returning one result per line"""
+    targets = [(number, line, parse_target(line)) for number, line in chunk]
+    usernames = [value for _, _, (kind, value) in targets if kind == "username"]
+
+    user_ids = await client.resolve_user_ids(usernames) if usernames else {}
+    ids = {value for _, _, (kind, value) in targets if kind == "user_id"}
+    ids.update(user_id for user_id in user_ids.values() if user_id)
+    statuses = await client.get_user_statuses(ids) if ids else {}
+
+    results = []
+    for number, line, (kind, value) in targets:
+        result = {"line": number, "input": line, "username": None, "user_id": None}
+        if kind == "username":
+            result["username"] = value
+            if value not in user_ids:
+                result["status"] = STATUS_UNKNOWN
+                results.append(result)
+                continue
+            result["user_id"] = user_ids[value]
+        else:
+            result["user_id"] = value
+
+        status = statuses.get(result["user_id"])
+        if result["user_id"] is None or (status is not None and not status.exists):
+            result["status"] = STATUS_NOT_FOUND
+        elif status is not None:
+            result["status"] = STATUS_BANNED if status.is_banned else STATUS_ACTIVE
+        else:
+            # Lookup failed
+            result["status"] = STATUS_UNKNOWN
+        results.append(result)
+    return results
+
+
+async def run_batch_check(client, stream, out=None, source="-", checkpoint_path=None,
+                          concurrency=4, chunk_size=500):
+    """
+    Check every username or user ID read from `stream`, writing one JSON result
+    per line to `out` in input order. Up to `concurrency` chunks are in flight
+    at once. With a checkpoint, a rerun over the same input skips lines already
+    written; a crash may repeat the last chunk, never skip one.
+    Returns a count of results per status.
+    """
+    out = out or sys.stdout
+    checkpoint = Checkpoint(checkpoint_path, source)
+    skip = checkpoint.load()
+    if skip:
+        logger.info(f"Resuming {source} after line {skip}")
+
+    counts = {}
+    done = skip
+    started = time.monotonic()
+    pending = deque()
+
+    async def flush_oldest():
+        nonlocal done
+        results = await pending.popleft()
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        out.flush()
+        done = results[-1]["line"]
+        checkpoint.save(done)
+        logger.info(f"Checked {done} line(s) ({(done - skip) / max(time.monotonic() - started, 1e-9):.0f}/s)")
+
+    for chunk in chunked(read_targets(stream, skip), chunk_size):
+        pending.append(asyncio.ensure_future(check_chunk(client, chunk)))
+        if len(pending) >= concurrency:
+            await flush_oldest()
+    while pending:
+        await flush_oldest()
+
+    logger.info(f"Batch check finished: {done} line(s), " + ", ".join(f"{status}={count}" for status, count in sorted(counts.items())))
+    return counts
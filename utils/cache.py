@@ -0,0 +1,112 @@
+import time
+import asyncio
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Dictionary whose entries expire a fixed number of seconds after being set"""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._purge_at = 1024
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires = entry
+            if time.monotonic() < expires:
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return default
+
+    def set(self, key, value, ttl=None):
+        now = time.monotonic()
+        self._entries[key] = (value, now + (self.ttl if ttl is None else ttl))
+
+        # Drop expired entries whenever the cache has doubled in size
+        if len(self._entries) >= self._purge_at:
+            self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+            self._purge_at = max(1024, len(self._entries) * 2)
+
+    def pop(self, key, default=None):
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        self._entries.clear()
+
+
+class LRUCache:
+    """Size-bounded cache that evicts the least recently used entry and expires entries after a TTL"""
+
+    def __init__(self, maxsize=1000, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires = entry
+            if time.monotonic() < expires:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return default
+
+    def set(self, key, value, ttl=None):
+        self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        self._entries.clear()
+
+
+class SingleFlight:
+    """Lets concurrent callers share one in-flight lookup instead of repeating it"""
+
+    def __init__(self):
+        self._inflight = {}
+
+    def get(self, key):
+        """Return the task already running for a key, if any"""
+        return self._inflight.get(key)
+
+    def run(self, keys, coro):
+        """Start `coro` once on behalf of every key and return the shared task"""
+        task = asyncio.ensure_future(coro)
+        for key in keys:
+            self._inflight[key] = task
+
+        def forget(_):
+            for key in keys:
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+
+        task.add_done_callback(forget)
+        return task
+
+    async def wait(self, task):
+        # Shield the shared task so one caller giving up doesn't cancel it for the rest
+        return await asyncio.shield(task)
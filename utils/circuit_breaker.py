@@ -0,0 +1,97 @@
+import time
+import logging
+import aiohttp
+from urllib.parse import urlsplit
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Raised instead of sending a request to a host whose breaker is open"""
+
+    def __init__(self, host):
+        super().__init__(f"Circuit breaker open for {host}")
+        self.host = host
+
+
+class CircuitBreaker:
+    """
+    Stops calling a host after repeated failures.
+    Once open, requests fail immediately until `reset_timeout` has passed; then
+    one trial request is let through and its outcome closes or reopens the breaker.
+    """
+
+    def __init__(self, host, failure_threshold=5, reset_timeout=30.0, on_state_change=None):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_state_change = on_state_change
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_started = None
+
+    def _set_state(self, state):
+        if state == self.state:
+            return
+        previous, self.state = self.state, state
+        logger.warning(f"Circuit breaker for {self.host}: {previous} -> {state}", extra={"endpoint": self.host})
+        if self.on_state_change:
+            try:
+                self.on_state_change(self.host, previous, state)
+            except Exception as e:
+                logger.error(f"Error handling breaker state change for {self.host}: {e}")
+
+    def allow(self):
+        """Whether a request may be sent now"""
+        if self.state == STATE_CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == STATE_OPEN:
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            self._set_state(STATE_HALF_OPEN)
+        # Half-open: one trial at a time, with a fresh one if it never reported back
+        if self._trial_started is not None and now - self._trial_started < self.reset_timeout:
+            return False
+        self._trial_started = now
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self._trial_started = None
+        self._set_state(STATE_CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_started = None
+        if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state(STATE_OPEN)
+
+
+class CircuitBreakers:
+    """One breaker per Roblox host, shared by every caller"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, on_state_change=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_state_change = on_state_change
+        self._breakers = {}
+
+    def __iter__(self):
+        return iter(self._breakers.values())
+
+    def breaker(self, url):
+        host = urlsplit(url).hostname or ""
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(
+                host, self.failure_threshold, self.reset_timeout,
+                on_state_change=lambda *args: self.on_state_change and self.on_state_change(*args)
+            )
+        return self._breakers[host]
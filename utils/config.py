@@ -1,7 +1,9 @@
 import os
 import json
-from dotenv import load_dotenv
+import time
+from dotenv import load_dotenv, dotenv_values
 import logging
+from utils.account_store import AccountStore
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -9,79 +11,174 @@ logger = logging.getLogger(__name__)
 # Load environment variables from .env file
 load_dotenv()
 
-class Config:
-    @staticmethod
-    def get_roblox_config():
-        """Returns the Roblox API configuration"""
-        # Force reload from .env
-        load_dotenv(override=True)
-        token = os.getenv('ROBLOX_TOKEN', '').strip().strip('"').strip("'")
-        username = os.getenv('ROBLOX_USERNAME', '').strip()
+ACCOUNT_PREFIX = 'ROBLOX_ACCOUNT_'
+
+
+def clean_account_token(value):
+    """Strip quotes, braces and the warning prefix from a stored token"""
+    # Clean the token value
+    token = value.strip().strip('"').strip("'")
+    
+    # Handle dictionary format
+    if token.startswith('{') and token.endswith('}'):
+        token = token[1:-1]  # Remove { }
+    
+    # Handle warning message
+    if token.startswith('_|WARNING:'):
+        token = token.split('|_', 2)[-1]
+
+    return token.strip()
+
+
+class AccountRegistry:
+    """
+    In-memory view of the configured accounts.
+    The main account comes from .env, which is reparsed only when it changes;
+    additional accounts live in the SQLite account store.
+    """
+
+    def __init__(self, path='.env', db_path='accounts.db', check_interval=1.0):
+        self.path = path
+        self.db_path = db_path
+        self.check_interval = check_interval
+        self.version = 0
+        self._mtime = None
+        self._checked_at = 0.0
+        self._main = {'token': '', 'username': ''}
+        self._store = None
+
+    @property
+    def store(self):
+        """Open the account store on first use"""
+        if self._store is None:
+            self._store = AccountStore(self.db_path)
+        return self._store
+
+    def _refresh(self):
+        """Reload the file if its modification time changed since the last read"""
+        now = time.monotonic()
+        if self._mtime is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = -1
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+
+        values = dotenv_values(self.path) if mtime != -1 else {}
+        self._load(values)
+
+    def _load(self, values):
+        token = (values.get('ROBLOX_TOKEN') or os.getenv('ROBLOX_TOKEN', '')).strip().strip('"').strip("'")
+        username = (values.get('ROBLOX_USERNAME') or os.getenv('ROBLOX_USERNAME', '')).strip().strip('"').strip("'")
 
         # If token includes warning message, extract just the token part
         if token.startswith('_|WARNING:'):
             token = token.split('|_', 2)[-1].rstrip('}')
-            
-        return {
-            'token': token,
-            'username': username
+        self._main = {'token': token, 'username': username}
+        self.version += 1
+
+        legacy = {
+            key[len(ACCOUNT_PREFIX):]: clean_account_token(value or '')
+            for key, value in values.items()
+            if key.startswith(ACCOUNT_PREFIX)
         }
+        if legacy:
+            self._migrate(legacy)
+
+    def _migrate(self, legacy):
+        """Move ROBLOX_ACCOUNT_* entries from .env into the account store"""
+        self.store.add_many(legacy)
+        for username in sorted(legacy):
+            logger.info(f"Found additional account: {username}")
+        logger.info(f"Migrated {len(legacy)} account(s) from {self.path} to {self.db_path}")
+
+        # Strip the migrated entries so they aren't imported again
+        with open(self.path, 'r') as f:
+            lines = [line for line in f.readlines() if not line.startswith(ACCOUNT_PREFIX)]
+        with open(self.path, 'w') as f:
+            f.writelines(lines)
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    def main_account(self):
+        self._refresh()
+        return dict(self._main)
+
+    def accounts(self):
+        self._refresh()
+        return self.store.all()
+
+    def find(self, username):
+        """Case-insensitive lookup returning (stored username, token) or None"""
+        self._refresh()
+        return self.store.get(username)
+
+    def find_by_user_id(self, user_id):
+        self._refresh()
+        return self.store.get_by_user_id(user_id)
+
+    def add(self, username, token):
+        self.store.add(username, token)
+        self.version += 1
+
+    def remove(self, username):
+        """Remove an account; returns the stored username, or None if it wasn't found"""
+        removed = self.store.remove(username)
+        if removed is not None:
+            self.version += 1
+        return removed
+
+    def replace(self, accounts):
+        self.store.replace_all(accounts)
+        self.version += 1
+
+    def set_user_ids(self, user_ids):
+        self.store.set_user_ids(user_ids)
+
+
+# Shared registry of configured accounts
+registry = AccountRegistry()
+
+
+class Config:
+    @staticmethod
+    def get_roblox_config():
+        """Returns the Roblox API configuration"""
+        return registry.main_account()
     
     @staticmethod
     def get_additional_accounts():
         """Returns additional accounts if configured"""
-        # Clear and reload environment variables
-        os.environ.clear()
-        load_dotenv(override=True)
-        
-        accounts = {}
-        logger.info("Scanning for additional accounts...")
-        
-        # Get all environment variables
-        for key, value in os.environ.items():
-            if key.startswith('ROBLOX_ACCOUNT_'):
-                username = key.replace('ROBLOX_ACCOUNT_', '')
-                # Clean the token value
-                token = value.strip().strip('"').strip("'")
-                
-                # Handle dictionary format
-                if token.startswith('{') and token.endswith('}'):
-                    token = token[1:-1]  # Remove { }
-                
-                # Handle warning message
-                if token.startswith('_|WARNING:'):
-                    token = token.split('|_', 2)[-1]
-                
-                accounts[username] = token.strip()
-                logger.info(f"Found additional account: {username}")
-        
-        logger.info(f"Total additional accounts found: {len(accounts)}")
-        return accounts
+        return registry.accounts()
     
+    @staticmethod
+    def add_account(username, token):
+        """Adds or updates a single additional account"""
+        try:
+            registry.add(username, token)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving account {username}: {e}")
+            return False
+
+    @staticmethod
+    def remove_account(username):
+        """Removes an additional account, returning its stored username or None"""
+        try:
+            return registry.remove(username)
+        except Exception as e:
+            logger.error(f"Error removing account {username}: {e}")
+            return None
+
     @staticmethod
     def save_additional_accounts(accounts):
         """Saves the updated accounts dictionary"""
         try:
-            # Load current .env content
-            if os.path.exists('.env'):
-                with open('.env', 'r') as f:
-                    lines = [line for line in f.readlines() 
-                            if not line.startswith('ROBLOX_ACCOUNT_')]
-            else:
-                lines = []
-
-            # Add new accounts
-            for username, token in accounts.items():
-                lines.append(f'ROBLOX_ACCOUNT_{username}={token}\n')
-
-            # Write back to .env
-            with open('.env', 'w') as f:
-                f.writelines(lines)
-
-            # Force reload environment
-            os.environ.clear()
-            load_dotenv(override=True)
-            
+            registry.replace(accounts)
             return True
         except Exception as e:
             logger.error(f"Error saving accounts: {e}")
@@ -0,0 +1,335 @@
+import json
+import time
+import random
+import hashlib
+import sqlite3
+import asyncio
+import logging
+import aiohttp
+import discord
+from datetime import datetime, timezone
+
+from utils.metrics import metrics
+from utils.rate_limiter import parse_retry_after
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deliveries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sink TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deliveries_due ON deliveries(sink, next_attempt);
+"""
+
+# Longest an idle worker sleeps before looking at the queue again
+IDLE_POLL = 60
+
+# Delivery latency buckets in seconds; retries can stretch into minutes
+DELIVERY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+delivery_latency = metrics.histogram(
+    "alert_delivery_seconds", "Time from queueing an alert message until the sink accepted it",
+    ("sink",), buckets=DELIVERY_BUCKETS
+)
+send_latency = metrics.histogram("alert_send_seconds", "Duration of each delivery attempt", ("sink",))
+delivery_attempts = metrics.counter(
+    "alert_delivery_attempts_total", "Delivery attempts by sink and outcome (delivered, retry, dropped)",
+    ("sink", "result")
+)
+
+
+class DeliveryError(Exception):
+    """A sink rejected a message; retried unless `permanent`"""
+
+    def __init__(self, message, retry_after=None, permanent=False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.permanent = permanent
+
+
+class Sink:
+    """Somewhere alert messages go; `send` takes a list of embed dicts"""
+
+    def __init__(self, name, concurrency=1):
+        self.name = name
+        self.concurrency = concurrency
+
+    async def send(self, embeds):
+        raise NotImplementedError
+
+
+class ChannelSink(Sink):
+    """A Discord channel reached through the bot's gateway connection"""
+
+    def __init__(self, name, get_channel, channel_id, concurrency=1):
+        super().__init__(name, concurrency)
+        self.get_channel = get_channel
+        self.channel_id = channel_id
+
+    async def send(self, embeds):
+        channel = self.get_channel(self.channel_id)
+        if channel is None:
+            # Not cached yet or the bot is reconnecting; try again later
+            raise DeliveryError(f"Channel {self.channel_id} not available")
+        try:
+            await channel.send(embeds=[discord.Embed.from_dict(embed) for embed in embeds])
+        except (discord.Forbidden, discord.NotFound) as e:
+            raise DeliveryError(str(e), permanent=True)
+        except discord.HTTPException as e:
+            raise DeliveryError(str(e))
+
+
+class WebhookSink(Sink):
+    """POSTs each message as JSON to a URL; the URL itself is never logged"""
+
+    def __init__(self, name, url, get_session, headers=None, concurrency=1):
+        super().__init__(name, concurrency)
+        self.url = url
+        self.get_session = get_session
+        self.headers = headers or {}
+
+    def body(self, embeds):
+        raise NotImplementedError
+
+    async def send(self, embeds):
+        try:
+            async with self.get_session().post(self.url, json=self.body(embeds), headers=self.headers) as response:
+                if response.status < 300:
+                    return
+                if response.status == 429:
+                    raise DeliveryError("HTTP 429", retry_after=parse_retry_after(response.headers))
+                # Other client errors won't go away by sending the same message again
+                raise DeliveryError(f"HTTP {response.status}", permanent=response.status < 500 and response.status != 408)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise DeliveryError(type(e).__name__)
+
+
+class DiscordWebhookSink(WebhookSink):
+    """A Discord webhook, independent of the gateway connection"""
+
+    def body(self, embeds):
+        return {"embeds": embeds}
+
+
+class HttpSink(WebhookSink):
+    """A generic JSON webhook, e.g. for incident tooling"""
+
+    def body(self, embeds):
+        return {
+            "source": "roblox-account-monitor",
+            "sent_at": datetime.now(timezone.utc).isoformat(),
+            "alerts": [
+                {
+                    "title": embed.get("title"),
+                    "description": embed.get("description"),
+                    "fields": [{"name": field["name"], "value": field["value"]} for field in embed.get("fields", [])],
+                }
+                for embed in embeds
+            ],
+        }
+
+
+SINK_TYPES = {
+    "channel": ChannelSink,
+    "discord_webhook": DiscordWebhookSink,
+    "http": HttpSink,
+}
+
+
+def default_sink_name(sink_type, sink_config):
+    """
+    Name derived from where the sink delivers, so queued messages stay with
+    it when sinks are added or reordered; URLs are hashed to keep tokens out of logs
+    """
+    if sink_type == "channel":
+        return f"channel-{sink_config['channel_id']}"
+    return f"{sink_type}-{hashlib.sha256(sink_config['url'].encode()).hexdigest()[:12]}"
+
+
+def build_sinks(sink_configs, get_channel, get_session):
+    """Create sinks from the `alert_sinks` config entries"""
+    sinks = []
+    for sink_config in sink_configs:
+        sink_type = sink_config.get("type", "channel")
+        if sink_type not in SINK_TYPES:
+            logger.error(f"Unknown alert sink type {sink_type!r}, skipping it")
+            continue
+        name = sink_config.get("name") or default_sink_name(sink_type, sink_config)
+        concurrency = sink_config.get("concurrency", 1)
+        if sink_type == "channel":
+            sinks.append(ChannelSink(name, get_channel, sink_config["channel_id"], concurrency))
+        else:
+            sinks.append(SINK_TYPES[sink_type](
+                name, sink_config["url"], get_session, headers=sink_config.get("headers"), concurrency=concurrency
+            ))
+    return sinks
+
+
+class AlertDelivery:
+    """
+    Fans alert messages out to every sink through a SQLite-backed queue.
+    Messages are on disk before the first send and leave it once a sink has
+    accepted them; failed sends are retried with exponential backoff, and
+    whatever is still queued at shutdown goes out after the next start.
+    """
+
+    def __init__(self, sinks, path='alert_queue.db', base_delay=5.0, max_delay=900.0, max_attempts=12):
+        self.sinks = {sink.name: sink for sink in sinks}
+        self.path = path
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._claimed = set()
+        self._wakeups = {}
+        self._tasks = []
+
+        # Kept on disk in case the sink is configured again
+        orphaned = {sink: count for sink, count in self.pending().items() if sink not in self.sinks}
+        if orphaned:
+            logger.warning(
+                "Queued alerts for sink(s) no longer configured are kept until they return: "
+                + ", ".join(f"{sink} ({count})" for sink, count in orphaned.items())
+            )
+
+    def __len__(self):
+        return sum(self.pending().values())
+
+    def pending(self):
+        """Queued messages per sink"""
+        return dict(self._conn.execute("SELECT sink, COUNT(*) FROM deliveries GROUP BY sink"))
+
+    def enqueue(self, embeds):
+        """Queue one message, given as a list of embed dicts, for every sink"""
+        now = time.time()
+        payload = json.dumps(embeds)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO deliveries (sink, payload, next_attempt, created) VALUES (?, ?, ?, ?)",
+                [(name, payload, now, now) for name in self.sinks]
+            )
+        for wakeup in self._wakeups.values():
+            wakeup.set()
+
+    def start(self):
+        if self._tasks:
+            return
+        for sink in self.sinks.values():
+            self._wakeups[sink.name] = asyncio.Event()
+            for _ in range(max(sink.concurrency, 1)):
+                self._tasks.append(asyncio.create_task(self._worker(sink)))
+        logger.info(f"Delivering alerts to {len(self.sinks)} sink(s): {', '.join(self.sinks)}")
+
+    async def stop(self, timeout=5.0):
+        """Give due messages a few seconds to go out, then stop; the rest stay queued on disk"""
+        if not self._tasks:
+            return
+        deadline = time.monotonic() + timeout
+        while self._due() and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeups = {}
+        self._claimed.clear()
+
+    def close(self):
+        self._conn.close()
+
+    def _due(self):
+        sinks = list(self.sinks)
+        if not sinks:
+            return 0
+        return self._conn.execute(
+            f"SELECT COUNT(*) FROM deliveries WHERE next_attempt <= ? AND sink IN ({', '.join('?' * len(sinks))})",
+            [time.time()] + sinks
+        ).fetchone()[0]
+
+    def _unclaimed(self):
+        """SQL condition and values excluding messages a worker is already sending"""
+        if not self._claimed:
+            return "", []
+        return f" AND id NOT IN ({', '.join('?' * len(self._claimed))})", list(self._claimed)
+
+    def _claim(self, sink_name):
+        """Take the next due message for a sink, hiding it from that sink's other workers"""
+        condition, values = self._unclaimed()
+        row = self._conn.execute(
+            "SELECT id, payload, attempts, created FROM deliveries WHERE sink = ? AND next_attempt <= ?"
+            + condition + " ORDER BY next_attempt, id LIMIT 1",
+            [sink_name, time.time()] + values
+        ).fetchone()
+        if row is not None:
+            self._claimed.add(row[0])
+        return row
+
+    def _next_wait(self, sink_name):
+        condition, values = self._unclaimed()
+        next_attempt = self._conn.execute(
+            "SELECT MIN(next_attempt) FROM deliveries WHERE sink = ?" + condition, [sink_name] + values
+        ).fetchone()[0]
+        if next_attempt is None:
+            return IDLE_POLL
+        return min(max(next_attempt - time.time(), 0), IDLE_POLL)
+
+    async def _worker(self, sink):
+        wakeup = self._wakeups[sink.name]
+        while True:
+            job = self._claim(sink.name)
+            if job is None:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self._next_wait(sink.name))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._deliver(sink, *job)
+            finally:
+                self._claimed.discard(job[0])
+
+    async def _deliver(self, sink, delivery_id, payload, attempts, created):
+        started = time.perf_counter()
+        try:
+            await sink.send(json.loads(payload))
+        except DeliveryError as e:
+            error = e
+        except Exception as e:
+            logger.error(f"Unexpected error delivering alert to {sink.name}: {e}")
+            error = DeliveryError(str(e))
+        else:
+            send_latency.observe(time.perf_counter() - started, sink=sink.name)
+            delivery_latency.observe(time.time() - created, sink=sink.name)
+            delivery_attempts.inc(sink=sink.name, result="delivered")
+            with self._conn:
+                self._conn.execute("DELETE FROM deliveries WHERE id = ?", (delivery_id,))
+            return
+        send_latency.observe(time.perf_counter() - started, sink=sink.name)
+
+        attempts += 1
+        if error.permanent or attempts >= self.max_attempts:
+            delivery_attempts.inc(sink=sink.name, result="dropped")
+            logger.error(f"Giving up on an alert for {sink.name} after {attempts} attempt(s): {error}")
+            with self._conn:
+                self._conn.execute("DELETE FROM deliveries WHERE id = ?", (delivery_id,))
+            return
+
+        # Exponential backoff with jitter, never sooner than the sink asked for
+        delay = min(self.base_delay * 2 ** (attempts - 1), self.max_delay) * random.uniform(0.8, 1.2)
+        delay = max(delay, error.retry_after or 0)
+        delivery_attempts.inc(sink=sink.name, result="retry")
+        logger.warning(f"Alert delivery to {sink.name} failed ({error}), retrying in {delay:.1f}s")
+        with self._conn:
+            self._conn.execute(
+                "UPDATE deliveries SET attempts = ?, next_attempt = ? WHERE id = ?",
+                (attempts, time.time() + delay, delivery_id)
+            )
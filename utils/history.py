@@ -0,0 +1,154 @@
+import time
+import sqlite3
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# One row per run of identical observations; a new row starts only when the
+# status or ban end changes, or when the account went unobserved for a while
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    user_id INTEGER NOT NULL,
+    started REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    status TEXT NOT NULL,
+    ban_end REAL,
+    event TEXT,
+    samples INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (user_id, started)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_history_started ON history(started);
+"""
+
+COLUMNS = ("user_id", "started", "last_seen", "status", "ban_end", "event", "samples")
+
+
+class HistoryStore:
+    """
+    Append-only SQLite log of account status observations, keyed by Roblox user ID.
+    Repeated identical observations only extend the current run, so years of
+    polling cost one row per status change. Writes are buffered until `flush`.
+    """
+
+    def __init__(self, path='history.db', max_gap=3600):
+        self.path = path
+        self.max_gap = max_gap
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+        # Latest run per user, so recording never reads from disk
+        self._open = {}
+        self._pending = {}
+        rows = self._conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM history AS h "
+            "WHERE started = (SELECT MAX(started) FROM history WHERE user_id = h.user_id)"
+        )
+        for row in rows:
+            run = dict(zip(COLUMNS, row))
+            self._open[run["user_id"]] = run
+        logger.info(f"Loaded history for {len(self._open)} accounts from {path}")
+
+    def record(self, user_id, status, ban_end=None, event=None, now=None):
+        """Add one observation; returns True if it started a new run"""
+        now = time.time() if now is None else now
+        run = self._open.get(user_id)
+        if (run is not None and run["status"] == status and run["ban_end"] == ban_end
+                and now - run["last_seen"] <= self.max_gap):
+            run["last_seen"] = now
+            run["samples"] += 1
+            started = False
+        else:
+            run = {
+                "user_id": user_id, "started": now, "last_seen": now,
+                "status": status, "ban_end": ban_end, "event": event, "samples": 1
+            }
+            self._open[user_id] = run
+            started = True
+        self._pending[(user_id, run["started"])] = run
+        return started
+
+    def flush(self):
+        """Write buffered observations in one transaction"""
+        if not self._pending:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO history ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    [tuple(run[column] for column in COLUMNS) for run in self._pending.values()]
+                )
+            self._pending = {}
+        except sqlite3.Error as e:
+            logger.error(f"Error saving status history: {e}")
+
+    def runs(self, user_id, since=None, until=None, limit=100):
+        """Runs overlapping [since, until] for one account, newest first"""
+        self.flush()
+        rows = self._conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM history "
+            "WHERE user_id = ? AND started <= ? AND last_seen >= ? "
+            "ORDER BY started DESC LIMIT ?",
+            (user_id, float("inf") if until is None else until, 0 if since is None else since, limit)
+        )
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def started_between(self, since, until, status=None):
+        """Runs of every account that started in [since, until], oldest first"""
+        self.flush()
+        query = f"SELECT {', '.join(COLUMNS)} FROM history WHERE started BETWEEN ? AND ?"
+        params = [since, until]
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        rows = self._conn.execute(query + " ORDER BY started", params)
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def compact(self, merge_before, delete_before=None):
+        """
+        Retention: merge neighbouring runs with the same status and ban end that
+        ended before `merge_before` (gaps from downtime no longer matter once
+        old), and drop runs that ended before `delete_before`.
+        Returns (rows merged, rows deleted).
+        """
+        self.flush()
+        open_runs = {(run["user_id"], run["started"]) for run in self._open.values()}
+        updates, removed = {}, []
+        current = None
+        rows = self._conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM history WHERE last_seen < ? ORDER BY user_id, started",
+            (merge_before,)
+        )
+        for row in rows:
+            run = dict(zip(COLUMNS, row))
+            if (run["user_id"], run["started"]) in open_runs:
+                current = None
+                continue
+            if (current is not None and current["user_id"] == run["user_id"]
+                    and current["status"] == run["status"] and current["ban_end"] == run["ban_end"]):
+                current["last_seen"] = run["last_seen"]
+                current["samples"] += run["samples"]
+                removed.append((run["user_id"], run["started"]))
+                updates[(current["user_id"], current["started"])] = current
+            else:
+                current = run
+
+        deleted = 0
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE history SET last_seen = ?, samples = ? WHERE user_id = ? AND started = ?",
+                [(run["last_seen"], run["samples"], run["user_id"], run["started"]) for run in updates.values()]
+            )
+            self._conn.executemany("DELETE FROM history WHERE user_id = ? AND started = ?", removed)
+            if delete_before is not None:
+                deleted = self._conn.execute("DELETE FROM history WHERE last_seen < ?", (delete_before,)).rowcount
+        if delete_before is not None:
+            for user_id, run in list(self._open.items()):
+                if run["last_seen"] < delete_before:
+                    del self._open[user_id]
+        return len(removed), deleted
+
+    def close(self):
+        self.flush()
+        self._conn.close()
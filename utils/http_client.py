@@ -0,0 +1,161 @@
+import time
+import asyncio
+import logging
+import aiohttp
+from utils.rate_limiter import RateLimiter
+from utils.circuit_breaker import CircuitBreakers, CircuitOpenError
+from utils.metrics import endpoint_label, request_latency, request_responses
+from utils.logs import request_sampler, redact_headers
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class _LimitedRequest:
+    """Async context manager that sends a request through the host's rate limiter and circuit breaker"""
+
+    def __init__(self, session, method, url, kwargs):
+        self._session = session
+        self._method = method
+        self._url = url
+        self._kwargs = kwargs
+        self._response = None
+        self._breaker = session.breakers.breaker(url)
+
+    async def __aenter__(self):
+        limiter = self._session.limiter
+        for attempt in range(self._session.max_retries + 1):
+            # Fail fast while the host is known to be down
+            if not self._breaker.allow():
+                raise CircuitOpenError(self._breaker.host)
+
+            await limiter.acquire(self._url)
+            endpoint = endpoint_label(self._url)
+            started = time.perf_counter()
+            try:
+                response = await self._session.raw.request(self._method, self._url, **self._kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                request_responses.inc(method=self._method, endpoint=endpoint, status="error")
+                self._breaker.record_failure()
+                raise
+            except Exception:
+                request_responses.inc(method=self._method, endpoint=endpoint, status="error")
+                raise
+            elapsed = time.perf_counter() - started
+            request_latency.observe(elapsed, method=self._method, endpoint=endpoint)
+            request_responses.inc(method=self._method, endpoint=endpoint, status=response.status)
+            if request_sampler.sampled():
+                logger.info(f"{self._method} {endpoint} -> {response.status}", extra={
+                    "endpoint": endpoint,
+                    "status": response.status,
+                    "seconds": round(elapsed, 3),
+                    "request_headers": redact_headers(self._kwargs.get("headers")),
+                    "response_headers": redact_headers(response.headers),
+                })
+            retry_after = limiter.update(self._url, response)
+            if retry_after is None or attempt == self._session.max_retries:
+                self._response = response
+                return response
+
+            # The host answered, so it's up; queue the request again instead of dropping it
+            self._breaker.record_success()
+            response.release()
+            await asyncio.sleep(retry_after)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._response is not None:
+            self._response.release()
+
+            # Reading the body can still time out, so judge the host here
+            if exc_type is not None and issubclass(exc_type, (aiohttp.ClientError, asyncio.TimeoutError)):
+                self._breaker.record_failure()
+            elif self._response.status >= 500:
+                self._breaker.record_failure()
+            elif exc_type is None or not issubclass(exc_type, asyncio.CancelledError):
+                self._breaker.record_success()
+
+
+class RateLimitedSession:
+    """Wraps the shared aiohttp session so every request passes the rate limiter"""
+
+    def __init__(self, session, limiter, max_retries, breakers):
+        self.raw = session
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.breakers = breakers
+
+    def request(self, method, url, **kwargs):
+        return _LimitedRequest(self, method, url, kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+
+class HttpClient:
+    """Owns the long-lived aiohttp session shared by every Roblox call"""
+
+    def __init__(self):
+        self._session = None
+        self.configure()
+
+    def configure(self, limit=100, limit_per_host=20, dns_cache_ttl=300, keepalive_timeout=60,
+                  rate_limits=None, max_retries=3, connect_timeout=5, read_timeout=15,
+                  breaker_threshold=5, breaker_reset=30):
+        """Set connection pool, timeout, rate limit and breaker options used when the session is next created"""
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.limiter = RateLimiter(rate_limits)
+        self.max_retries = max_retries
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.breakers = CircuitBreakers(breaker_threshold, breaker_reset)
+
+    @property
+    def session(self):
+        """Return the shared session, creating it inside the running event loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+                enable_cleanup_closed=True
+            )
+            # Requests carry per-account cookies explicitly, so never let
+            # response cookies leak from one account into another
+            raw_session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.DummyCookieJar(),
+                # No overall cap, so rate limit retries can wait; stalled connections and reads can't
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    sock_connect=self.connect_timeout,
+                    sock_read=self.read_timeout
+                )
+            )
+            self._session = RateLimitedSession(raw_session, self.limiter, self.max_retries, self.breakers)
+            logger.info(
+                f"Opened HTTP session (pool={self.limit}, per host={self.limit_per_host}, "
+                f"DNS cache={self.dns_cache_ttl}s)"
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared session and its connection pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Closed HTTP session")
+        self._session = None
+
+
+# Process-wide client used by the bot, the CLI and utils
+http_client = HttpClient()
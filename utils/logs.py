@@ -0,0 +1,116 @@
+import re
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+
+# Header values that authenticate a request and must never reach the logs
+SECRET_HEADERS = {"cookie", "set-cookie", "authorization", "x-csrf-token"}
+
+# .ROBLOSECURITY values, with or without the warning prefix, wherever they appear in text
+_COOKIE_PATTERN = re.compile(r"(\.ROBLOSECURITY=)[^;\s'\"]+")
+_WARNING_PATTERN = re.compile(r"_\|WARNING:[^|]*\|_[^;\s'\"]+")
+_HEADER_PATTERN = re.compile(r"(['\"]?(?:Cookie|Authorization|X-CSRF-TOKEN)['\"]?\s*[:=]\s*['\"]?)[^'\",}\n]+", re.IGNORECASE)
+
+REDACTED = "[REDACTED]"
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def redact(text):
+    """Mask cookies, tokens and auth headers in free text"""
+    text = _COOKIE_PATTERN.sub(r"\1" + REDACTED, str(text))
+    text = _WARNING_PATTERN.sub(REDACTED, text)
+    return _HEADER_PATTERN.sub(r"\1" + REDACTED, text)
+
+
+def redact_headers(headers):
+    """Copy of a header mapping with authentication values masked"""
+    return {
+        name: REDACTED if name.lower() in SECRET_HEADERS else value
+        for name, value in dict(headers or {}).items()
+    }
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any `extra` fields (account, endpoint, ...) at the top level"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact(record.getMessage()),
+        }
+        for name, value in vars(record).items():
+            if name not in _STANDARD_ATTRIBUTES and not name.startswith("_"):
+                entry[name] = value
+        if record.exc_info:
+            entry["exception"] = redact(self.formatException(record.exc_info))
+        return json.dumps(entry, default=str)
+
+
+class RedactingFormatter(logging.Formatter):
+    """Plain text formatter that still masks secrets"""
+
+    def format(self, record):
+        return redact(super().format(record))
+
+
+class RequestLogSampler:
+    """Decides which requests get verbose header/body logging; off unless enabled"""
+
+    def __init__(self, enabled=False, sample_rate=0.01):
+        self.configure(enabled, sample_rate)
+
+    def configure(self, enabled=False, sample_rate=0.01):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+
+    def sampled(self):
+        return self.enabled and random.random() < self.sample_rate
+
+
+# Shared sampler for verbose request/response logging
+request_sampler = RequestLogSampler()
+
+_listener = None
+
+
+def setup_logging(level="INFO", json_format=True, stream=None):
+    """
+    Send every log record through a queue to a background thread, so logging
+    never blocks the event loop on a slow console or disk.
+    Does nothing if the root logger was already configured.
+    """
+    global _listener
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    if json_format:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(RedactingFormatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+    records = queue.SimpleQueue() if hasattr(queue, "SimpleQueue") else queue.Queue()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush queued records and stop the background writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,232 @@
+import re
+import bisect
+import logging
+from aiohttp import web
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Monitor cycle buckets in seconds
+CYCLE_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Numeric path segments (user IDs) collapsed so endpoints don't explode into one series per user
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_label(url):
+    """Host and path of a Roblox URL with user IDs replaced by {id}"""
+    url = url.split("?", 1)[0]
+    if "://" in url:
+        url = url.split("://", 1)[1]
+    return _ID_SEGMENT.sub("/{id}", url)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    metric_type = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels):
+        return tuple((name, labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self):
+        """Yield (sample name, label pairs, value)"""
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    metric_type = "counter"
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        values = self.function() if self.function else self._values
+        for key, value in values.items():
+            yield self.name, key, value
+
+
+class Gauge(Metric):
+    metric_type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+        self._values = {}
+
+    def set(self, value, **labels):
+        self._values[self._key(labels)] = value
+
+    def samples(self):
+        values = self.function() if self.function else self._values
+        for key, value in values.items():
+            yield self.name, key, value
+
+
+class Histogram(Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+        series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+        series["sum"] += value
+
+    def totals(self):
+        """(sum, count) of every observation across all label sets"""
+        return (
+            sum(series["sum"] for series in self._series.values()),
+            sum(sum(series["counts"]) for series in self._series.values())
+        )
+
+    def samples(self):
+        for key, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                cumulative += count
+                yield f"{self.name}_bucket", key + (("le", _format_value(float(bound))),), cumulative
+            yield f"{self.name}_sum", key, series["sum"]
+            yield f"{self.name}_count", key, cumulative
+
+
+class MetricsRegistry:
+    """Every metric the bot exports, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=(), function=None):
+        return self.register(Counter(name, documentation, labelnames, function))
+
+    def gauge(self, name, documentation, labelnames=(), function=None):
+        return self.register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                logger.error(f"Error collecting metric {metric.name}: {e}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by the bot and utils
+metrics = MetricsRegistry()
+
+request_latency = metrics.histogram(
+    "roblox_request_duration_seconds",
+    "Latency of requests to the Roblox API by endpoint",
+    ("method", "endpoint")
+)
+request_responses = metrics.counter(
+    "roblox_responses_total",
+    "Responses from the Roblox API by endpoint and status code",
+    ("method", "endpoint", "status")
+)
+
+
+def track_caches(caches):
+    """Export hit and miss counters for {name: cache} (TTLCache or LRUCache)"""
+    def counts(attribute):
+        return lambda: {(("cache", name),): getattr(cache, attribute) for name, cache in caches.items()}
+
+    def hit_ratios():
+        ratios = {}
+        for name, cache in caches.items():
+            lookups = cache.hits + cache.misses
+            ratios[(("cache", name),)] = cache.hits / lookups if lookups else 0.0
+        return ratios
+
+    metrics.counter("cache_hits_total", "Cache lookups answered from the cache", ("cache",), function=counts("hits"))
+    metrics.counter("cache_misses_total", "Cache lookups that missed", ("cache",), function=counts("misses"))
+    metrics.gauge("cache_hit_ratio", "Share of cache lookups answered from the cache", ("cache",), function=hit_ratios)
+    metrics.gauge("cache_entries", "Entries currently held by each cache", ("cache",),
+                  function=lambda: {(("cache", name),): len(cache) for name, cache in caches.items()})
+
+
+class MetricsServer:
+    """Serves GET /metrics on a local port"""
+
+    def __init__(self, registry=metrics, host="127.0.0.1", port=None):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def _handle(self, request):
+        return web.Response(
+            text=self.registry.render(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+        )
+
+    async def start(self):
+        """Start serving if a port is configured; safe to call more than once"""
+        if not self.port or self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, self.host, self.port).start()
+        except OSError as e:
+            logger.error(f"Could not start metrics endpoint on {self.host}:{self.port}: {e}")
+            await self._runner.cleanup()
+            self._runner = None
+            return
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
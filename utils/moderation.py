@@ -0,0 +1,94 @@
+import asyncio
+import logging
+
+from utils.circuit_breaker import CircuitOpenError
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+USERS_URL = "https://users.roblox.com/v1/users"
+
+# Returned by fetch_ban_flag for an ID Roblox doesn't know
+USER_NOT_FOUND = object()
+
+# Maximum number of user IDs accepted by a single multi-user request
+BATCH_SIZE = 100
+
+
+async def fetch_unbanned_ids(session, user_ids):
+    """
+    Look up one batch of user IDs with banned users excluded.
+    Returns {user ID: isBanned} for every user the response covered.
+    """
+    async with session.post(
+        USERS_URL,
+        json={"userIds": user_ids, "excludeBannedUsers": True}
+    ) as response:
+        if response.status != 200:
+            raise Exception(f"Multi-user lookup failed with status {response.status}")
+        data = await response.json()
+
+    return {entry["id"]: entry.get("isBanned", False) for entry in data.get("data", [])}
+
+
+async def fetch_ban_flag(session, user_id):
+    """Read isBanned for a single user, or USER_NOT_FOUND if there is no such user"""
+    async with session.get(f"{USERS_URL}/{user_id}") as response:
+        if response.status == 404:
+            return USER_NOT_FOUND
+        if response.status != 200:
+            raise Exception(f"User lookup failed with status {response.status}")
+        data = await response.json()
+    return data.get("isBanned", False)
+
+
+async def fetch_ban_flags(session, user_ids):
+    """
+    Fetch isBanned for many users with one request per batch of 100 IDs.
+    Banned users are left out of the batch response, so only those IDs are
+    confirmed with a per-user request. Returns {user ID: isBanned}, with
+    USER_NOT_FOUND for IDs Roblox doesn't know; IDs whose lookup failed,
+    including every ID of a failed batch, are left out.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    flags = {}
+
+    batches = [user_ids[i:i + BATCH_SIZE] for i in range(0, len(user_ids), BATCH_SIZE)]
+    results = await asyncio.gather(
+        *(fetch_unbanned_ids(session, batch) for batch in batches),
+        return_exceptions=True
+    )
+    uncovered = []
+    errors = []
+    failed = 0
+    for batch, result in zip(batches, results):
+        if isinstance(result, Exception):
+            # A failing host would only fail 100 single lookups too; leave the batch to the next cycle
+            failed += len(batch)
+            errors.append(result)
+            continue
+        flags.update(result)
+        uncovered.extend(user_id for user_id in batch if user_id not in result)
+    if errors:
+        logger.error(f"Error fetching ban flags in bulk for {failed} user(s) in {len(errors)} batch(es): {errors[0]}")
+
+    # Fall back to per-user requests only for IDs a successful batch left out
+    if uncovered:
+        logger.info(f"Confirming ban status for {len(uncovered)} user(s) individually")
+        results = await asyncio.gather(
+            *(fetch_ban_flag(session, user_id) for user_id in uncovered),
+            return_exceptions=True
+        )
+        circuit_open = 0
+        for user_id, result in zip(uncovered, results):
+            if isinstance(result, CircuitOpenError):
+                circuit_open += 1
+                continue
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching ban status for user {user_id}: {result}")
+                continue
+            flags[user_id] = result
+        if circuit_open:
+            logger.error(f"Skipped ban status for {circuit_open} user(s): {USERS_URL} circuit breaker open")
+
+    return flags
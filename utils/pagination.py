@@ -0,0 +1,66 @@
+import discord
+
+# Discord's limit on an embed description
+DESCRIPTION_LIMIT = 4096
+
+
+def build_pages(lines, title, color, per_page=20):
+    """Split lines into embeds of at most `per_page` lines that fit in a description"""
+    chunks = [[]]
+    size = 0
+    for line in lines:
+        if chunks[-1] and (len(chunks[-1]) == per_page or size + len(line) + 1 > DESCRIPTION_LIMIT):
+            chunks.append([])
+            size = 0
+        chunks[-1].append(line)
+        size += len(line) + 1
+
+    pages = []
+    for number, chunk in enumerate(chunks, start=1):
+        embed = discord.Embed(title=title, description="\n".join(chunk), color=color)
+        if len(chunks) > 1:
+            embed.set_footer(text=f"Page {number}/{len(chunks)} · {len(lines)} total")
+        pages.append(embed)
+    return pages
+
+
+class PaginatorView(discord.ui.View):
+    """Previous/next buttons for flipping through a list of embeds"""
+
+    def __init__(self, pages, author_id=None, timeout=180):
+        super().__init__(timeout=timeout)
+        self.pages = pages
+        self.author_id = author_id
+        self.index = 0
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = self.index == len(self.pages) - 1
+
+    async def interaction_check(self, interaction):
+        # Only whoever ran the command can flip pages
+        return self.author_id is None or interaction.user.id == self.author_id
+
+    async def _show(self, interaction):
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.pages[self.index], view=self)
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction, button):
+        self.index = max(self.index - 1, 0)
+        await self._show(interaction)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction, button):
+        self.index = min(self.index + 1, len(self.pages) - 1)
+        await self._show(interaction)
+
+
+async def send_pages(ctx, pages, destination=None):
+    """Send the first page, with navigation buttons if there is more than one"""
+    destination = destination or ctx
+    if len(pages) == 1:
+        await destination.send(embed=pages[0])
+        return
+    await destination.send(embed=pages[0], view=PaginatorView(pages, author_id=ctx.author.id))
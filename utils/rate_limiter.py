@@ -0,0 +1,127 @@
+import time
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Requests per second and burst size for each Roblox host
+DEFAULT_LIMITS = {
+    "users.roblox.com": {"rate": 10, "burst": 20},
+    "auth.roblox.com": {"rate": 3, "burst": 5},
+    "accountsettings.roblox.com": {"rate": 5, "burst": 10},
+}
+FALLBACK_LIMIT = {"rate": 5, "burst": 10}
+
+# Longest we are willing to wait on a single Retry-After
+MAX_RETRY_AFTER = 60
+
+
+def parse_retry_after(headers, default=5.0):
+    """Read Retry-After as seconds, accepting both delta-seconds and HTTP dates"""
+    value = headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER)
+    except ValueError:
+        pass
+    try:
+        return min(max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    """Token bucket whose rate backs off on 429s and slowly recovers"""
+
+    def __init__(self, rate, burst):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._refill(now)
+            # Reserve a token up front; a negative balance is the queue ahead of us
+            self._tokens -= 1
+            if self._tokens < 0:
+                await asyncio.sleep(-self._tokens / self.rate)
+            return
+
+    def pause(self, seconds):
+        """Hold all requests for the given number of seconds"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def throttled(self, retry_after):
+        """Back off after a 429"""
+        self.rate = max(self.rate / 2, 0.1)
+        self._tokens = min(self._tokens, 0.0)
+        self.pause(retry_after)
+
+    def succeeded(self):
+        """Recover towards the configured rate after a successful request"""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class RateLimiter:
+    """One token bucket per Roblox host, shared by every caller"""
+
+    def __init__(self, limits=None):
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self._buckets = {}
+
+    def bucket(self, url):
+        host = urlsplit(url).hostname or ""
+        if host not in self._buckets:
+            limit = self.limits.get(host, FALLBACK_LIMIT)
+            self._buckets[host] = TokenBucket(limit["rate"], limit["burst"])
+        return self._buckets[host]
+
+    async def acquire(self, url):
+        await self.bucket(url).acquire()
+
+    def update(self, url, response):
+        """
+        Adapt the host's bucket to a response.
+        Returns the number of seconds to wait before retrying, or None if no retry is needed.
+        """
+        bucket = self.bucket(url)
+
+        if response.status == 429:
+            retry_after = parse_retry_after(response.headers)
+            bucket.throttled(retry_after)
+            logger.warning(
+                f"Rate limited by {urlsplit(url).hostname}, backing off {retry_after:.1f}s "
+                f"(now {bucket.rate:.1f} req/s)"
+            )
+            return retry_after
+
+        # Respect explicit rate-limit headers before we hit a 429
+        remaining = response.headers.get("x-ratelimit-remaining")
+        reset = response.headers.get("x-ratelimit-reset")
+        if remaining is not None and reset is not None:
+            try:
+                if int(float(remaining)) <= 0:
+                    bucket.pause(min(float(reset), MAX_RETRY_AFTER))
+            except ValueError:
+                pass
+
+        bucket.succeeded()
+        return None
@@ -0,0 +1,329 @@
+import os
+import json
+import time
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+from utils.cache import TTLCache
+from utils.http_client import http_client
+from utils.logs import request_sampler, redact, redact_headers
+from utils.moderation import fetch_ban_flags, USER_NOT_FOUND
+from utils.user_resolver import UserIdCache, resolve_user_ids
+from utils.state_store import parse_roblox_date
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+AUTHENTICATED_USER_URL = "https://users.roblox.com/v1/users/authenticated"
+BAN_STATUS_URL = "https://accountsettings.roblox.com/v1/users/{user_id}/ban-status"
+
+COOKIE_PREFIX = "_|WARNING:-DO-NOT-SHARE-THIS.--Sharing-this-will-allow-someone-to-log-in-as-you-and-to-steal-your-ROBUX-and-items.|_"
+
+
+class RobloxApiError(Exception):
+    """Roblox answered with something other than a usable result"""
+
+
+@dataclass
+class UserStatus:
+    user_id: int
+    is_banned: bool
+    # False for an ID Roblox doesn't know, e.g. a deleted account
+    exists: bool = True
+
+
+@dataclass
+class BanDetails:
+    user_id: int
+    ban_duration: Optional[str] = None
+    ban_end_date: Optional[str] = None
+    banned_from_place: Optional[int] = None
+    reason_text: Optional[str] = None
+    raw: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, user_id, data):
+        return cls(
+            user_id=user_id,
+            ban_duration=data.get("banDuration"),
+            ban_end_date=data.get("banEndDate"),
+            banned_from_place=data.get("bannedFromPlace"),
+            reason_text=data.get("reasonText"),
+            raw=data
+        )
+
+    @property
+    def identity(self):
+        """Fields that only change when the account gets a different ban"""
+        return json.dumps([self.ban_end_date, self.banned_from_place, self.reason_text, self.ban_duration])
+
+    @property
+    def expires_at(self):
+        """When the ban ends as a timestamp, or None for a permanent ban"""
+        return parse_roblox_date(self.ban_end_date)
+
+
+class BanDetailCache:
+    """
+    Ban details per user ID, persisted as JSON and kept until the ban ends.
+    Details don't change mid-ban, so each ban costs one ban-status request.
+    """
+
+    def __init__(self, path='ban_details.json'):
+        self.path = path
+        self._entries = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        """Load cached details from disk, starting empty if the file is missing"""
+        try:
+            with open(self.path, 'r') as f:
+                self._entries = {
+                    int(user_id): BanDetails.from_json(int(user_id), data)
+                    for user_id, data in json.load(f).items()
+                }
+            logger.info(f"Loaded cached ban details for {len(self._entries)} users")
+        except FileNotFoundError:
+            self._entries = {}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Error loading ban detail cache: {e}")
+            self._entries = {}
+
+    def save(self):
+        """Write the cache to disk if it changed"""
+        if not self._dirty:
+            return
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({user_id: details.raw for user_id, details in self._entries.items()}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Error saving ban detail cache: {e}")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, user_id, now=None):
+        """Cached details of the user's current ban, or None if unknown or past its end date"""
+        details = self._entries.get(user_id)
+        if details is not None:
+            expires_at = details.expires_at
+            if expires_at is None or (now if now is not None else time.time()) < expires_at:
+                self.hits += 1
+                return details
+            # The ban should be over; a ban still in place was extended or replaced
+            self.discard(user_id)
+        self.misses += 1
+        return None
+
+    def put(self, details):
+        """Store details; returns True if they describe a different ban than the cached one"""
+        previous = self._entries.get(details.user_id)
+        if previous is not None and previous.identity == details.identity:
+            return False
+        self._entries[details.user_id] = details
+        self._dirty = True
+        return True
+
+    def discard(self, user_id):
+        if self._entries.pop(user_id, None) is not None:
+            self._dirty = True
+
+
+@dataclass
+class AuthenticatedUser:
+    user_id: int
+    name: str
+    display_name: Optional[str] = None
+
+
+def clean_token(token: str) -> str:
+    """Strip quotes, braces and the warning prefix from a .ROBLOSECURITY value"""
+    # Clean the token
+    token = token.strip().strip('"').strip("'")
+
+    # Handle dictionary format
+    if token.startswith('{') and token.endswith('}'):
+        token = token[1:-1]  # Remove { }
+
+    # Handle warning message
+    if token.startswith('_|WARNING:'):
+        token = token.split('|_', 2)[-1]
+
+    return token
+
+
+def token_fingerprint(token: str) -> str:
+    """Short, non-reversible identifier for a token, safe to use as a cache key"""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def cookie_headers(token: str) -> dict:
+    """Request headers authenticating as the account that owns `token`"""
+    return {
+        'Cookie': f'.ROBLOSECURITY={COOKIE_PREFIX}{clean_token(token)}',
+        'Accept': 'application/json',
+        'Content-Type': 'application/json',
+        'User-Agent': 'Roblox/WinInet',
+        'Referer': 'https://www.roblox.com/',
+        'Origin': 'https://www.roblox.com',
+    }
+
+
+class RobloxClient:
+    """Async access to the Roblox endpoints the bot uses, over the shared HTTP session"""
+
+    def __init__(self, user_id_cache=None, client=None, ban_details=None):
+        self._user_id_cache = user_id_cache
+        self._ban_details = ban_details
+        self.http = client or http_client
+        # CSRF tokens keyed by token fingerprint, refreshed only when Roblox challenges with a 403
+        self.csrf_tokens = TTLCache(ttl=1800)
+
+    @property
+    def user_id_cache(self):
+        """Username -> user ID cache, loaded from its default file on first use if none was given"""
+        if self._user_id_cache is None:
+            self._user_id_cache = UserIdCache()
+        return self._user_id_cache
+
+    @user_id_cache.setter
+    def user_id_cache(self, cache):
+        self._user_id_cache = cache
+
+    @property
+    def ban_details(self):
+        """Ban detail cache, loaded from its default file on first use if none was given"""
+        if self._ban_details is None:
+            self._ban_details = BanDetailCache()
+        return self._ban_details
+
+    @ban_details.setter
+    def ban_details(self, cache):
+        self._ban_details = cache
+
+    @property
+    def session(self):
+        return self.http.session
+
+    async def resolve_user_ids(self, usernames: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Map usernames to user IDs (None if the user doesn't exist); failed lookups are left out"""
+        return await resolve_user_ids(self.session, list(usernames), self.user_id_cache)
+
+    async def get_user_statuses(self, user_ids: Iterable[int]) -> Dict[int, UserStatus]:
+        """Moderation status for many users; failed lookups are left out"""
+        flags = await fetch_ban_flags(self.session, list(user_ids))
+        return {
+            user_id: UserStatus(user_id, False, exists=False) if is_banned is USER_NOT_FOUND
+            else UserStatus(user_id, is_banned)
+            for user_id, is_banned in flags.items()
+        }
+
+    async def get_ban_details(self, user_id: int, token: str, refresh: bool = False) -> Optional[BanDetails]:
+        """
+        Ban details for an account, read with its own credentials and cached until the ban ends.
+        Returns None if the token was rejected.
+        """
+        if not refresh:
+            cached = self.ban_details.get(user_id)
+            if cached is not None:
+                return cached
+
+        async with self.session.get(
+            BAN_STATUS_URL.format(user_id=user_id),
+            headers=cookie_headers(token)
+        ) as response:
+            if response.status == 401:
+                return None
+            if response.status != 200:
+                raise RobloxApiError(f"Ban details request failed with status {response.status}")
+            details = BanDetails.from_json(user_id, await response.json())
+
+        if self.ban_details.put(details):
+            logger.info(f"Cached details of a new ban for user {user_id}")
+        return details
+
+    async def get_authenticated_user(self, token: str) -> Optional[AuthenticatedUser]:
+        """
+        The user a token logs in as.
+        Returns None if Roblox rejected the token.
+        """
+        token = clean_token(token)
+        fingerprint = token_fingerprint(token)
+        headers = cookie_headers(token)
+        headers['X-CSRF-TOKEN'] = self.csrf_tokens.get(fingerprint, '')
+
+        for attempt in range(2):
+            async with self.session.get(AUTHENTICATED_USER_URL, headers=headers, ssl=True) as response:
+                # A 403 carrying a new CSRF token is a challenge; retry once with it
+                csrf_token = response.headers.get('x-csrf-token')
+                if response.status == 403 and csrf_token and attempt == 0:
+                    self.csrf_tokens.set(fingerprint, csrf_token)
+                    headers['X-CSRF-TOKEN'] = csrf_token
+                    logger.debug("Refreshed CSRF token after challenge")
+                    continue
+
+                response_text = await response.text()
+                if request_sampler.sampled():
+                    logger.info("Auth response", extra={
+                        "endpoint": AUTHENTICATED_USER_URL,
+                        "status": response.status,
+                        "response_headers": redact_headers(response.headers),
+                        "body": redact(response_text[:1000]),
+                    })
+
+                if response.status == 401:
+                    return None
+
+                if response.status != 200:
+                    logger.error(f"Authentication failed with status {response.status}", extra={
+                        "endpoint": AUTHENTICATED_USER_URL,
+                        "status": response.status,
+                        "body": redact(response_text[:500]),
+                    })
+                    raise RobloxApiError(f"Authentication failed with status {response.status}")
+
+                try:
+                    data = json.loads(response_text)
+                except json.JSONDecodeError as je:
+                    raise RobloxApiError(f"Failed to parse JSON response: {je}")
+
+                if 'name' not in data:
+                    raise RobloxApiError("Response missing 'name' field")
+
+                return AuthenticatedUser(user_id=data.get('id'), name=data['name'], display_name=data.get('displayName'))
+
+        raise RobloxApiError("Authentication kept failing the CSRF challenge")
+
+    async def check_account_status(self, username: str, token: Optional[str] = None) -> str:
+        """
+        Checks the status of an account (e.g., banned, unbanned, invalid credentials).
+        Returns "banned", "unbanned", or "invalid".
+        """
+        user_ids = await self.resolve_user_ids([username])
+        if username not in user_ids:
+            raise RobloxApiError(f"Username lookup failed for {username}")
+        user_id = user_ids[username]
+        if user_id is None:
+            return "invalid"
+
+        if token is not None and await self.get_authenticated_user(token) is None:
+            return "invalid"
+
+        statuses = await self.get_user_statuses([user_id])
+        if user_id not in statuses:
+            raise RobloxApiError(f"Moderation status lookup failed for {username}")
+        if not statuses[user_id].exists:
+            return "invalid"
+        return "banned" if statuses[user_id].is_banned else "unbanned"
+
+
+# Process-wide client shared by the bot, the CLI and utils
+roblox_client = RobloxClient()
@@ -0,0 +1,105 @@
+import time
+import heapq
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """
+    Deadline-ordered queue deciding when each account is next checked.
+    Accounts that just changed, are near an expected unban or are flagged as
+    high priority are polled more often; stable accounts are backed off.
+    """
+
+    def __init__(self, base_interval=300, min_interval=60, max_interval=1800,
+                 backoff=1.5, priority_interval=60, priority_accounts=None):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.priority_interval = priority_interval
+        self.priority_accounts = {name.lower() for name in (priority_accounts or [])}
+        self._heap = []
+        self._due = {}
+        self._intervals = {}
+
+    def __len__(self):
+        return len(self._due)
+
+    def _push(self, username, due):
+        self._due[username] = due
+        heapq.heappush(self._heap, (due, username))
+
+    def sync(self, usernames, now=None, last_checked=None):
+        """
+        Track exactly the given accounts. New accounts checked recently, according
+        to the optional `last_checked(username)` lookup, keep their place in the
+        cycle; the rest are spread over one base interval.
+        """
+        now = now if now is not None else time.time()
+        wanted = set(usernames)
+
+        for username in list(self._due):
+            if username not in wanted:
+                del self._due[username]
+                self._intervals.pop(username, None)
+
+        added = [username for username in usernames if username not in self._due]
+        overdue = []
+        for username in added:
+            self._intervals[username] = self.base_interval
+            checked = last_checked(username) if last_checked else None
+            if checked is not None and checked + self.base_interval > now:
+                self._push(username, checked + self.base_interval)
+            else:
+                overdue.append(username)
+        for index, username in enumerate(overdue):
+            self._push(username, now + self.base_interval * index / len(overdue))
+
+        if added:
+            logger.info(f"Scheduled {len(added)} new account(s) for monitoring")
+
+    def pop_due(self, now=None):
+        """Remove and return every account whose deadline has passed"""
+        now = now if now is not None else time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, username = heapq.heappop(self._heap)
+            # Skip stale heap entries left behind by rescheduling or removal
+            if self._due.get(username) != deadline:
+                continue
+            del self._due[username]
+            due.append(username)
+        return due
+
+    def lag(self, now=None):
+        """Seconds the most overdue account is behind its deadline"""
+        now = now if now is not None else time.time()
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return 0.0
+        return max(0.0, now - self._heap[0][0])
+
+    def reschedule(self, username, succeeded=True, changed=False, ban_end=None, now=None):
+        """Pick the next deadline for an account after it has been checked"""
+        now = now if now is not None else time.time()
+        interval = self._intervals.get(username, self.base_interval)
+
+        if not succeeded or changed:
+            # Recheck failed or recently changed accounts soon
+            interval = self.min_interval
+        else:
+            interval = min(interval * self.backoff, self.max_interval)
+        self._intervals[username] = interval
+
+        delay = interval
+        if username.lower() in self.priority_accounts:
+            delay = min(delay, self.priority_interval)
+        if ban_end is not None:
+            # Check shortly after the expected unban, and often once it's overdue
+            delay = min(delay, max(ban_end - now, self.min_interval))
+
+        self._push(username, now + delay)
@@ -0,0 +1,383 @@
+import json
+import time
+import hmac
+import bisect
+import asyncio
+import hashlib
+import logging
+
+from utils.circuit_breaker import STATE_CLOSED, STATE_OPEN
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Virtual nodes per worker; more points spread accounts more evenly
+REPLICAS = 100
+
+# Assignment messages list every account, so allow long lines
+STREAM_LIMIT = 2 ** 24
+
+
+def _hash(key):
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping account names to workers.
+    Adding or removing a worker only moves the accounts on its arcs.
+    """
+
+    def __init__(self, nodes=(), replicas=REPLICAS):
+        self.replicas = replicas
+        self._points = []
+        self._owners = {}
+        self.nodes = set()
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def add(self, node):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            self._owners[point] = node
+            bisect.insort(self._points, point)
+
+    def remove(self, node):
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            if self._owners.get(point) == node:
+                del self._owners[point]
+                self._points.pop(bisect.bisect_left(self._points, point))
+
+    def owner(self, key):
+        """Worker owning `key`, or None if the ring is empty"""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(key.lower())) % len(self._points)
+        return self._owners[self._points[index]]
+
+    def partition(self, keys):
+        """Split keys into {worker: [keys]}; every worker gets an entry"""
+        partitions = {node: [] for node in self.nodes}
+        for key in keys:
+            owner = self.owner(key)
+            if owner is not None:
+                partitions[owner].append(key)
+        return partitions
+
+
+def _encode(message):
+    return (json.dumps(message) + "\n").encode()
+
+
+def _check_secret(expected, given):
+    # Without a configured secret nobody gets in, not even a client sending none
+    if not expected:
+        return False
+    return hmac.compare_digest(expected.encode(), (given or "").encode())
+
+
+class _WorkerConnection:
+    def __init__(self, worker_id, writer):
+        self.worker_id = worker_id
+        self.writer = writer
+        self.assigned = {}
+        self.open_hosts = set()
+        self.last_seen = time.monotonic()
+
+    def send(self, message):
+        self.writer.write(_encode(message))
+
+
+class Coordinator:
+    """
+    Discord-facing side of sharded monitoring.
+    Workers connect over TCP, each is handed its consistent-hash share of the
+    accounts along with their tokens, and every result they report goes to
+    `on_result`. Shares are recomputed whenever a worker joins, leaves or
+    stops sending heartbeats.
+    Circuit breaker reports are merged over all workers: `on_breaker_change`
+    hears when the first worker finds a host down and when the last one recovers.
+    Each worker's per-cycle Roblox request latency goes to `on_latency` as (sum, count).
+    """
+
+    def __init__(self, on_result, host="127.0.0.1", port=8765, secret=None, heartbeat_timeout=30,
+                 on_breaker_change=None, on_latency=None):
+        self.on_result = on_result
+        self.on_breaker_change = on_breaker_change
+        self.on_latency = on_latency
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.heartbeat_timeout = heartbeat_timeout
+        self.ring = HashRing()
+        self.workers = {}
+        self._accounts = {}
+        self._server = None
+
+    async def start(self):
+        """Start accepting workers; safe to call more than once"""
+        if self._server is not None:
+            return
+        if not self.secret:
+            # Workers receive every token, so never hand them to whoever connects
+            logger.error("Not starting shard coordinator: shard_secret is not set")
+            return
+        try:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=STREAM_LIMIT)
+        except OSError as e:
+            # No workers can join, so the bot keeps checking every account itself
+            logger.error(f"Could not start shard coordinator on {self.host}:{self.port}: {e}")
+            return
+        logger.info(f"Shard coordinator listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._server is None:
+            return
+        self._server.close()
+        for worker in list(self.workers.values()):
+            worker.writer.close()
+        await self._server.wait_closed()
+        self._server = None
+        self.workers.clear()
+        self.ring = HashRing()
+
+    def assign(self, accounts):
+        """Set the accounts ({username: token}) to spread over the workers, dropping any that went silent"""
+        now = time.monotonic()
+        for worker in list(self.workers.values()):
+            if now - worker.last_seen > self.heartbeat_timeout:
+                logger.warning(f"Shard worker {worker.worker_id} missed its heartbeats, dropping it")
+                worker.writer.close()
+                self._drop(worker)
+
+        accounts = dict(sorted(accounts.items()))
+        if accounts != self._accounts:
+            self._accounts = accounts
+            self._rebalance()
+
+    def _drop(self, worker):
+        if self.workers.get(worker.worker_id) is worker:
+            del self.workers[worker.worker_id]
+            self.ring.remove(worker.worker_id)
+            self._rebalance()
+            # Hosts only this worker saw failing count as recovered once it's gone
+            for host in worker.open_hosts:
+                self._breaker_changed(host, was_down=True)
+
+    def _host_down(self, host):
+        return any(host in worker.open_hosts for worker in self.workers.values())
+
+    def _breaker_report(self, worker, host, state):
+        was_down = self._host_down(host)
+        if state == STATE_OPEN:
+            worker.open_hosts.add(host)
+        elif state == STATE_CLOSED:
+            worker.open_hosts.discard(host)
+        self._breaker_changed(host, was_down)
+
+    def _breaker_changed(self, host, was_down):
+        down = self._host_down(host)
+        if down == was_down or self.on_breaker_change is None:
+            return
+        try:
+            if down:
+                self.on_breaker_change(host, STATE_CLOSED, STATE_OPEN)
+            else:
+                self.on_breaker_change(host, STATE_OPEN, STATE_CLOSED)
+        except Exception as e:
+            logger.error(f"Error handling breaker report for {host}: {e}")
+
+    def _rebalance(self):
+        partitions = self.ring.partition(self._accounts)
+        for worker_id, usernames in partitions.items():
+            worker = self.workers[worker_id]
+            # Tokens travel with the assignment, so workers never read a stale copy of the accounts
+            assigned = {username: self._accounts[username] for username in usernames}
+            if assigned == worker.assigned:
+                continue
+            worker.assigned = assigned
+            try:
+                worker.send({"type": "assign", "accounts": assigned})
+            except Exception as e:
+                logger.error(f"Error sending assignment to shard worker {worker_id}: {e}")
+        logger.info(
+            f"Rebalanced {len(self._accounts)} accounts over {len(self.workers)} shard worker(s): "
+            + ", ".join(f"{worker_id}={len(usernames)}" for worker_id, usernames in sorted(partitions.items()))
+        )
+
+    async def _handle(self, reader, writer):
+        worker = None
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            if hello.get("type") != "hello" or not hello.get("worker"):
+                writer.close()
+                return
+            if not _check_secret(self.secret, hello.get("secret")):
+                logger.warning(f"Rejected shard worker {hello.get('worker')}: bad secret")
+                writer.close()
+                return
+
+            worker = _WorkerConnection(str(hello["worker"]), writer)
+            previous = self.workers.get(worker.worker_id)
+            if previous is not None:
+                previous.writer.close()
+            self.workers[worker.worker_id] = worker
+            self.ring.add(worker.worker_id)
+            logger.info(f"Shard worker {worker.worker_id} joined")
+            self._rebalance()
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                worker.last_seen = time.monotonic()
+                message = json.loads(line)
+                if message.get("type") == "breaker" and message.get("host"):
+                    self._breaker_report(worker, message["host"], message.get("state"))
+                    continue
+                if message.get("type") == "latency":
+                    if self.on_latency is not None and message.get("count"):
+                        try:
+                            self.on_latency(message["sum"], message["count"])
+                        except Exception as e:
+                            logger.error(f"Error handling latency report from {worker.worker_id}: {e}")
+                    continue
+                if message.get("type") != "result":
+                    continue
+                # Ignore results for accounts that moved to another worker meanwhile
+                if message.get("username") not in worker.assigned:
+                    continue
+                try:
+                    self.on_result(
+                        message["username"], message.get("status"), message.get("ban_data"), message.get("user_id")
+                    )
+                except Exception as e:
+                    logger.error(f"Error handling result for {message.get('username')}: {e}")
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError) as e:
+            logger.error(f"Shard worker connection error: {e}")
+        finally:
+            writer.close()
+            if worker is not None and self.workers.get(worker.worker_id) is worker:
+                logger.info(f"Shard worker {worker.worker_id} left")
+                self._drop(worker)
+
+
+class ShardWorker:
+    """
+    Worker side of sharded monitoring: keeps a connection to the coordinator,
+    tracks the accounts ({username: token}) it currently owns and reports
+    check results back.
+    """
+
+    def __init__(self, worker_id, host="127.0.0.1", port=8765, secret=None, heartbeat_interval=10):
+        self.worker_id = worker_id
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.heartbeat_interval = heartbeat_interval
+        self.assigned = {}
+        self._open_hosts = set()
+        self._writer = None
+        self._task = None
+
+    @property
+    def connected(self):
+        return self._writer is not None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def send_result(self, username, status, ban_data=None, user_id=None):
+        """Report one check result; dropped if the coordinator is unreachable"""
+        if self._writer is None:
+            return False
+        self._writer.write(_encode({
+            "type": "result", "username": username, "status": status, "ban_data": ban_data, "user_id": user_id
+        }))
+        return True
+
+    def send_latency(self, total, count):
+        """Report the summed duration and number of Roblox requests made during one cycle"""
+        if self._writer is None:
+            return False
+        self._writer.write(_encode({"type": "latency", "sum": total, "count": count}))
+        return True
+
+    def send_breaker_change(self, host, previous, state):
+        """Tell the coordinator a Roblox host's breaker changed; signature matches CircuitBreakers.on_state_change"""
+        if state == STATE_OPEN:
+            self._open_hosts.add(host)
+        elif state == STATE_CLOSED:
+            self._open_hosts.discard(host)
+        if self._writer is not None:
+            self._writer.write(_encode({"type": "breaker", "host": host, "state": state}))
+
+    async def _run(self):
+        delay = 1
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port, limit=STREAM_LIMIT)
+            except OSError as e:
+                logger.error(f"Could not reach shard coordinator at {self.host}:{self.port}: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+                continue
+
+            delay = 1
+            writer.write(_encode({"type": "hello", "worker": self.worker_id, "secret": self.secret}))
+            # The coordinator forgets our breakers when we disconnect, so repeat any still open
+            for host in self._open_hosts:
+                writer.write(_encode({"type": "breaker", "host": host, "state": STATE_OPEN}))
+            self._writer = writer
+            logger.info(f"Connected to shard coordinator at {self.host}:{self.port}")
+            heartbeat = asyncio.create_task(self._heartbeat(writer))
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    message = json.loads(line)
+                    if message.get("type") == "assign":
+                        accounts = message.get("accounts") or {}
+                        missing = sorted(username for username, token in accounts.items() if not token)
+                        if missing:
+                            logger.warning(f"Assigned {len(missing)} account(s) without a token, skipping: {', '.join(missing)}")
+                        self.assigned = {username: token for username, token in accounts.items() if token}
+                        logger.info(f"Assigned {len(self.assigned)} account(s)")
+            except (ConnectionError, ValueError) as e:
+                logger.error(f"Shard coordinator connection error: {e}")
+            finally:
+                heartbeat.cancel()
+                self._writer = None
+                writer.close()
+
+            # The coordinator takes our accounts back while we're gone
+            self.assigned = {}
+            logger.warning("Lost connection to shard coordinator, reconnecting")
+            await asyncio.sleep(delay)
+
+    async def _heartbeat(self, writer):
+        while True:
+            writer.write(_encode({"type": "heartbeat"}))
+            await writer.drain()
+            await asyncio.sleep(self.heartbeat_interval)
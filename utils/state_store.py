@@ -0,0 +1,127 @@
+import os
+import json
+import time
+import logging
+from datetime import datetime, timezone
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Account statuses recorded by the monitor
+STATUS_ACTIVE = "active"
+STATUS_BANNED = "banned"
+STATUS_INVALID = "invalid"
+STATUS_NOT_FOUND = "not_found"
+
+# Transitions the monitor alerts on
+EVENT_BANNED = "banned"
+EVENT_UNBANNED = "unbanned"
+EVENT_BAN_EXTENDED = "ban_extended"
+EVENT_TOKEN_INVALID = "token_invalid"
+EVENT_NOT_FOUND = "not_found"
+
+
+def parse_roblox_date(value):
+    """Parse an ISO 8601 date from the Roblox API into a UTC timestamp"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class StateStore:
+    """Durable last-known state per account, used to alert only on transitions"""
+
+    def __init__(self, path='account_state.json'):
+        self.path = path
+        self._states = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Load saved states from disk, starting empty if the file is missing"""
+        try:
+            with open(self.path, 'r') as f:
+                self._states = json.load(f)
+            logger.info(f"Loaded saved state for {len(self._states)} accounts")
+        except FileNotFoundError:
+            self._states = {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading account state: {e}")
+            self._states = {}
+
+    def save(self):
+        """Write states to disk if anything changed"""
+        if not self._dirty:
+            return
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._states, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Error saving account state: {e}")
+
+    def get(self, username):
+        return self._states.get(username.lower())
+
+    def last_checked(self, username):
+        """Timestamp of the account's last recorded check, or None"""
+        state = self.get(username)
+        return state.get("last_checked") if state else None
+
+    def statuses(self):
+        """Last recorded status of every account, keyed by lowercase username"""
+        return {username: state["status"] for username, state in self._states.items()}
+
+    def record(self, username, status, ban_end_date=None):
+        """
+        Store the latest observation for an account.
+        Returns the transition event to alert on, or None if nothing changed.
+        """
+        previous = self.get(username) or {}
+        previous_status = previous.get("status")
+        event = None
+
+        if status == STATUS_BANNED:
+            if previous_status != STATUS_BANNED:
+                event = EVENT_BANNED
+            elif ban_end_date is None:
+                # Still banned and details weren't refetched
+                ban_end_date = previous.get("ban_end_date")
+            else:
+                old_end = parse_roblox_date(previous.get("ban_end_date"))
+                new_end = parse_roblox_date(ban_end_date)
+                # A dated ban that became permanent or ends later was extended
+                if old_end is not None and (new_end is None or new_end > old_end):
+                    event = EVENT_BAN_EXTENDED
+        elif status == STATUS_ACTIVE:
+            if previous_status == STATUS_BANNED:
+                event = EVENT_UNBANNED
+        elif status == STATUS_INVALID:
+            if previous_status != STATUS_INVALID:
+                event = EVENT_TOKEN_INVALID
+        elif status == STATUS_NOT_FOUND:
+            if previous_status != STATUS_NOT_FOUND:
+                event = EVENT_NOT_FOUND
+
+        self._states[username.lower()] = {
+            "status": status,
+            "ban_end_date": ban_end_date if status == STATUS_BANNED else None,
+            "last_checked": time.time(),
+            "last_alerted": previous.get("last_alerted")
+        }
+        self._dirty = True
+        return event
+
+    def mark_alerted(self, username):
+        state = self.get(username)
+        if state is not None:
+            state["last_alerted"] = time.time()
+            self._dirty = True
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import logging
+from collections import deque
+
+from utils.state_store import STATUS_ACTIVE, STATUS_BANNED
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DAY = 86400
+WEEK = 7 * DAY
+
+
+class RosterStats:
+    """
+    Running roster totals, updated as each check result comes in so that
+    reading them never needs a scan of the roster or any Roblox request.
+    Persisted as JSON next to the account state.
+    """
+
+    def __init__(self, path='roster_stats.json', latency_weight=0.1):
+        self.path = path
+        self.latency_weight = latency_weight
+        self._statuses = {}
+        self.counts = {}
+        self._ban_started = {}
+        self._recent_bans = deque()
+        self.completed_bans = 0
+        self.total_ban_seconds = 0.0
+        self.check_latency = None
+        self._dirty = False
+        self.load()
+
+    def __len__(self):
+        return len(self._statuses)
+
+    def load(self):
+        """Load saved totals from disk, starting empty if the file is missing"""
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading roster stats: {e}")
+            return
+        self._statuses = saved.get("statuses", {})
+        self.counts = {}
+        for status in self._statuses.values():
+            self.counts[status] = self.counts.get(status, 0) + 1
+        self._ban_started = saved.get("ban_started", {})
+        self._recent_bans = deque(saved.get("recent_bans", []))
+        self.completed_bans = saved.get("completed_bans", 0)
+        self.total_ban_seconds = saved.get("total_ban_seconds", 0.0)
+        self.check_latency = saved.get("check_latency")
+
+    def save(self):
+        """Write totals to disk if anything changed"""
+        if not self._dirty:
+            return
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    "statuses": self._statuses,
+                    "ban_started": self._ban_started,
+                    "recent_bans": list(self._recent_bans),
+                    "completed_bans": self.completed_bans,
+                    "total_ban_seconds": self.total_ban_seconds,
+                    "check_latency": self.check_latency,
+                }, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Error saving roster stats: {e}")
+
+    def seed(self, statuses):
+        """Take current statuses from saved account state, without counting them as new bans"""
+        for username, status in statuses.items():
+            if username.lower() not in self._statuses:
+                self._set_status(username.lower(), status)
+                if status == STATUS_BANNED:
+                    self._ban_started.setdefault(username.lower(), None)
+
+    def _set_status(self, key, status):
+        previous = self._statuses.get(key)
+        if previous is not None:
+            self.counts[previous] -= 1
+            if not self.counts[previous]:
+                del self.counts[previous]
+        if status is None:
+            self._statuses.pop(key, None)
+        else:
+            self._statuses[key] = status
+            self.counts[status] = self.counts.get(status, 0) + 1
+        self._dirty = True
+        return previous
+
+    def record(self, username, status, now=None):
+        """Apply one check result; only a change of status touches the totals"""
+        key = username.lower()
+        previous = self._statuses.get(key)
+        if previous == status:
+            return
+        now = time.time() if now is None else now
+        self._set_status(key, status)
+
+        # Only an unban ends a ban; a token failing mid-ban leaves it open
+        if status == STATUS_ACTIVE:
+            started = self._ban_started.pop(key, None)
+            if previous == STATUS_BANNED and started is not None:
+                self.completed_bans += 1
+                self.total_ban_seconds += now - started
+        elif status == STATUS_BANNED and key not in self._ban_started:
+            # An account first seen banned was banned at some unknown earlier time
+            self._ban_started[key] = now if previous is not None else None
+            if previous is not None:
+                self._recent_bans.append(now)
+                self._prune(now)
+
+    def retain(self, usernames):
+        """Forget accounts that are no longer monitored"""
+        keep = {username.lower() for username in usernames}
+        for key in [key for key in self._statuses if key not in keep]:
+            self._set_status(key, None)
+            self._ban_started.pop(key, None)
+
+    def observe_latency(self, seconds):
+        """Fold one monitor cycle's mean Roblox request latency into the moving average"""
+        if self.check_latency is None:
+            self.check_latency = seconds
+        else:
+            self.check_latency += self.latency_weight * (seconds - self.check_latency)
+        self._dirty = True
+
+    def _prune(self, now):
+        while self._recent_bans and self._recent_bans[0] < now - WEEK:
+            self._recent_bans.popleft()
+
+    def bans_since(self, since):
+        """New bans seen since `since`, at most a week back"""
+        count = 0
+        for banned_at in reversed(self._recent_bans):
+            if banned_at < since:
+                break
+            count += 1
+        return count
+
+    def mean_ban_duration(self):
+        return self.total_ban_seconds / self.completed_bans if self.completed_bans else None
+
+    def summary(self, now=None):
+        now = time.time() if now is None else now
+        self._prune(now)
+        return {
+            "counts": dict(self.counts),
+            "bans_24h": self.bans_since(now - DAY),
+            "bans_7d": len(self._recent_bans),
+            "mean_ban_duration": self.mean_ban_duration(),
+            "completed_bans": self.completed_bans,
+            "check_latency": self.check_latency,
+        }
@@ -0,0 +1,109 @@
+import os
+import json
+import asyncio
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+USERNAMES_URL = "https://users.roblox.com/v1/usernames/users"
+
+# Maximum number of usernames accepted by a single lookup request
+BATCH_SIZE = 100
+
+
+class UserIdCache:
+    """Persistent username -> user ID mapping stored as JSON; kept in memory only if `path` is None"""
+
+    def __init__(self, path='user_ids.json'):
+        self.path = path
+        self._ids = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Load cached IDs from disk, starting empty if the file is missing"""
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._ids = {name.lower(): int(user_id) for name, user_id in json.load(f).items()}
+            logger.info(f"Loaded {len(self._ids)} cached user IDs")
+        except FileNotFoundError:
+            self._ids = {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading user ID cache: {e}")
+            self._ids = {}
+
+    def get(self, username):
+        return self._ids.get(username.lower())
+
+    def set(self, username, user_id):
+        if self._ids.get(username.lower()) != user_id:
+            self._ids[username.lower()] = user_id
+            self._dirty = True
+
+    def save(self):
+        """Write the cache to disk if it changed"""
+        if not self._dirty or self.path is None:
+            return
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._ids, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Error saving user ID cache: {e}")
+
+
+async def fetch_user_ids(session, usernames):
+    """Look up one batch of usernames, returning {lowercase username: user ID}"""
+    async with session.post(
+        USERNAMES_URL,
+        json={"usernames": usernames, "excludeBannedUsers": False}
+    ) as response:
+        if response.status != 200:
+            raise Exception(f"Username lookup failed with status {response.status}")
+        data = await response.json()
+
+    return {entry["requestedUsername"].lower(): entry["id"] for entry in data.get("data", [])}
+
+
+async def resolve_user_ids(session, usernames, cache):
+    """
+    Resolve usernames to user IDs, only asking Roblox about names not in the cache.
+    Returns {username: user ID or None}; None means Roblox has no such user.
+    Usernames whose lookup failed are left out so callers can retry later.
+    """
+    resolved = {}
+    missing = []
+    for username in usernames:
+        user_id = cache.get(username)
+        if user_id is None:
+            missing.append(username)
+        else:
+            resolved[username] = user_id
+
+    if not missing:
+        return resolved
+
+    batches = [missing[i:i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+    logger.info(f"Resolving {len(missing)} usernames in {len(batches)} batch(es)")
+    results = await asyncio.gather(
+        *(fetch_user_ids(session, batch) for batch in batches),
+        return_exceptions=True
+    )
+
+    for batch, result in zip(batches, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error resolving usernames: {result}")
+            continue
+        for username in batch:
+            user_id = result.get(username.lower())
+            resolved[username] = user_id
+            if user_id is not None:
+                cache.set(username, user_id)
+
+    cache.save()
+    return resolved